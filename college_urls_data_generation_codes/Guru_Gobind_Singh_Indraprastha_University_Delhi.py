@@ -1,11 +1,28 @@
+import sys
+from pathlib import Path
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import pandas as pd
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scrapers.table_extract import Column, TableSpec, read_tables, to_frame
+
 URL = "http://www.ipu.ac.in/listinstitute041018.php"
 
+# both tables in one execute_script (scrapers/table_extract.py)
+TABLE = TableSpec(
+    columns={
+        "S.No": Column(0),
+        "Institute Name & Address": Column(1),
+        # link target, plain cell text when there is no link
+        "Website": Column(2, "href", fallback="text"),
+    },
+    skip_rows=2,   # heading rows
+    min_cells=3,
+)
+
 # ---------- Chrome Options ----------
 options = uc.ChromeOptions()
 options.add_argument("--headless=new")
@@ -16,44 +33,17 @@ options.add_argument("--window-size=1920,1080")
 driver = uc.Chrome(options=options)
 wait = WebDriverWait(driver, 20)
 
-def scrape_table(table_element):
-    rows = table_element.find_elements(By.TAG_NAME, "tr")
-    data = []
-
-    for row in rows[2:]:  # skip heading rows
-        cols = row.find_elements(By.TAG_NAME, "td")
-        if len(cols) < 3:
-            continue
-
-        sno = cols[0].text.strip()
-        institute = cols[1].text.strip()
-
-        # Website handling (anchor or plain text)
-        try:
-            link = cols[2].find_element(By.TAG_NAME, "a")
-            website = link.get_attribute("href")
-        except:
-            website = cols[2].text.strip()
-
-        data.append({
-            "S.No": sno,
-            "Institute Name & Address": institute,
-            "Website": website
-        })
-
-    return pd.DataFrame(data)
-
 try:
     driver.get(URL)
     wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
 
-    tables = driver.find_elements(By.TAG_NAME, "table")
+    tables = read_tables(driver, "table", "tr")
 
     # First table = Part A
-    df_A = scrape_table(tables[0])
+    df_A = to_frame(tables[0], TABLE)
 
     # Second table = Part B
-    df_B = scrape_table(tables[1])
+    df_B = to_frame(tables[1], TABLE)
 
     # ---------- Save to Excel (2 Sheets) ----------
     with pd.ExcelWriter("Guru_Gobind_Singh_Indraprastha_University_Delhi(2018-2019).xlsx", engine="openpyxl") as writer:
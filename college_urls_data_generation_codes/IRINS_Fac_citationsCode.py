@@ -1,33 +1,155 @@
-# opens the IRINS instances page, iterates through all pages of institutes,
-# visits each institute's page to scrape faculty, publication, patent, and citation data,
-# and saves the compiled data into an Excel file with checkpointing for resumption.
-# Requires: undetected-chromedriver, pandas, openpyxl, beautifulsoup4, selenium
-import time
+# opens the IRINS instances page, reads the whole institute list in one go,
+# then fetches every institute's page concurrently (plain HTTP where the counters
+# are in the served HTML, browser workers otherwise) to scrape faculty, publication,
+# patent, and citation data, and saves the compiled data into an Excel file.
+# Rows land in a JSONL sink as they come in; institutes already in it are skipped on resume.
+# Requires: undetected-chromedriver, pandas, openpyxl, beautifulsoup4, selenium, requests
 import os
+import sys
+import threading
 import pandas as pd
+import requests
 import undetected_chromedriver as uc
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from queue import Queue
+from requests.adapters import HTTPAdapter
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scrapers.datatables import harvest_datatable, wait_for_datatable
+from scrapers.table_extract import Column, TableSpec, records
+from utils.result_sink import JsonlSink, write_excel
+
 # --------------------------------------------------
 # CONFIG
 # --------------------------------------------------
 START_URL = "https://irins.org/instances"
 OUTPUT_FILE = "irins_all_colleges_data_updated.xlsx"
-CHECKPOINT_FILE = "checkpoint.txt"
+SINK_FILE = "irins_all_colleges_data_updated.jsonl"   # rows are appended here, Excel is written at the end
+
+HTTP_WORKERS = 16            # concurrent plain-HTTP fetches of institute pages
+BROWSER_WORKERS = 2          # Chrome instances for pages whose counters need JS
+HTTP_TIMEOUT = (10, 30)      # (connect, read) seconds
+DETAIL_WAIT_SEC = 20         # browser: max wait for the counters to appear
+
+# institute list (#orgTable, DataTables) → one record per institute
+INSTITUTE_TABLE = TableSpec(
+    columns={
+        "AISHE Code": Column(0),
+        "Institute Name": Column(1),
+        "Institute Type": Column(2),
+        "District": Column(3),
+        "State / UT": Column(4),
+        "Institute URL": Column(5, "href"),
+    },
+    min_cells=6,
+)
+
 
 # --------------------------------------------------
-# LOAD CHECKPOINT (IF EXISTS)
+# INSTITUTE PAGE PARSING
 # --------------------------------------------------
-last_processed_url = None
-if os.path.exists(CHECKPOINT_FILE):
-    with open(CHECKPOINT_FILE, "r") as f:
-        last_processed_url = f.read().strip()
+def to_int(text) -> int:
+    """Counter text ("1,234", " 56 ") → int, anything else → 0."""
+    value = str(text or "").strip().replace(",", "")
+    return int(value) if value.isdigit() else 0
+
+
+def counters_rendered(soup) -> bool:
+    """True if the counters are in the HTML (no JS needed to fill them)."""
+    total_f = soup.select_one("#total_f")
+    return bool(total_f) and total_f.text.strip().replace(",", "").isdigit()
+
+
+def parse_institute_page(soup, institute: dict) -> dict:
+    row = dict(institute)
+
+    # ---------------- TOTAL FACULTY ----------------
+    total_f = soup.select_one("#total_f")
+    row["Total Faculty / Scientist"] = to_int(total_f.text) if total_f else 0
+
+    # ---------------- TOTAL PUBLICATIONS ----------------
+    total_p = soup.select_one("#total_p")
+    row["Total Publications"] = to_int(total_p.text) if total_p else 0
+
+    # ---------------- PUBLICATION BREAKUP (ALL) ----------------
+    for li in soup.select("ul.reseacher-box-ul li"):
+        label = str(li.contents[0]).strip() if li.contents else ""
+        counter = li.find("span", class_="counter-home")
+        if label and counter:
+            row[label] = to_int(counter.text)
+
+    # ---------------- TOTAL PATENTS ----------------
+    total_patent = soup.select_one("#total_patent")
+    row["Total Patents"] = to_int(total_patent.text) if total_patent else 0
+
+    # ---------------- IMPACT / CITATIONS ----------------
+    row["Google Scholar Citations"] = 0
+    row["Scopus Citations"] = 0
+
+    impact_block = soup.select_one("div.service-block-v3.service-block-sea")
+    if impact_block:
+        counters = impact_block.select("span.counter")
+        if len(counters) >= 2:
+            row["Google Scholar Citations"] = to_int(counters[0].text)
+            row["Scopus Citations"] = to_int(counters[1].text)
+
+    return row
+
+
+# --------------------------------------------------
+# FETCHERS
+# --------------------------------------------------
+def http_session(driver) -> requests.Session:
+    """Pooled session carrying the browser's cookies and user agent."""
+    session = requests.Session()
+    session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent")
+    for c in driver.get_cookies():
+        session.cookies.set(c["name"], c["value"], domain=c.get("domain"), path=c.get("path", "/"))
+
+    adapter = HTTPAdapter(pool_connections=HTTP_WORKERS, pool_maxsize=HTTP_WORKERS, max_retries=1)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_http(session, institute: dict):
+    """Parsed row, or None if the page needs a browser (counters filled by JS / fetch failed)."""
+    try:
+        r = session.get(institute["Institute URL"], timeout=HTTP_TIMEOUT)
+        r.raise_for_status()
+    except requests.RequestException as e:
+        print(f"[HTTP] {institute['Institute Name']}: {e} → browser")
+        return None
+
+    soup = BeautifulSoup(r.text, "html.parser")
+    if not counters_rendered(soup):
+        return None
+    return parse_institute_page(soup, institute)
+
+
+def fetch_browser(drivers: Queue, institute: dict) -> dict:
+    """Borrow a free browser, load the page, wait for the counters (no fixed sleep)."""
+    browser = drivers.get()
+    try:
+        browser.get(institute["Institute URL"])
+        try:
+            WebDriverWait(browser, DETAIL_WAIT_SEC, poll_frequency=0.25).until(
+                lambda d: d.execute_script(
+                    "const el = document.querySelector('#total_f');"
+                    "return !!el && /\\d/.test(el.textContent);"
+                )
+            )
+        except Exception:
+            pass   # page without counters → parsed as zeros, as before
+        return parse_institute_page(BeautifulSoup(browser.page_source, "html.parser"), institute)
+    finally:
+        drivers.put(browser)
 
-resume_skipping = bool(last_processed_url)
 
 # --------------------------------------------------
 # START UNDETECTED CHROME
@@ -40,114 +162,89 @@ driver = uc.Chrome(options=options)
 wait = WebDriverWait(driver, 30)
 
 # --------------------------------------------------
-# LOAD EXISTING EXCEL (IF EXISTS)
+# RESULT SINK (rows of earlier runs are already in it)
 # --------------------------------------------------
-if os.path.exists(OUTPUT_FILE):
+sink = JsonlSink(SINK_FILE)
+
+# first run after switching to the sink → carry over the existing Excel once
+if not sink.path.exists() and os.path.exists(OUTPUT_FILE):
     df_existing = pd.read_excel(OUTPUT_FILE)
-    all_rows = df_existing.to_dict("records")
-else:
-    all_rows = []
+    sink.write(df_existing.to_dict("records"))
+
+# ---------------- DONE INDEX (resume) ----------------
+done = {r.get("Institute URL") for r in sink.read()}
 
 # --------------------------------------------------
-# OPEN INSTANCES PAGE
+# PHASE 1: WHOLE INSTITUTE LIST IN ONE CALL (DataTables API, no page clicks)
 # --------------------------------------------------
 driver.get(START_URL)
 wait.until(EC.presence_of_element_located((By.ID, "orgTable")))
-time.sleep(2)
+wait_for_datatable(driver, "#orgTable")
+
+institutes = records(harvest_datatable(driver, "#orgTable")["rows"], INSTITUTE_TABLE)
+todo = list({i["Institute URL"]: i for i in institutes if i["Institute URL"] and i["Institute URL"] not in done}.values())
+print(f"Institutes found: {len(institutes)} | already done: {len(institutes) - len(todo)} | to fetch: {len(todo)}")
 
 # --------------------------------------------------
-# PAGINATION LOOP
+# PHASE 2: INSTITUTE PAGES, CONCURRENTLY
 # --------------------------------------------------
-while True:
-    rows = driver.find_elements(By.CSS_SELECTOR, "#orgTable tbody tr")
-
-    for row in rows:
-        cols = row.find_elements(By.TAG_NAME, "td")
-        if len(cols) < 6:
-            continue
-
-        institute = {
-            "AISHE Code": cols[0].text.strip(),
-            "Institute Name": cols[1].text.strip(),
-            "Institute Type": cols[2].text.strip(),
-            "District": cols[3].text.strip(),
-            "State / UT": cols[4].text.strip(),
-            "Institute URL": cols[5].find_element(By.TAG_NAME, "a").get_attribute("href")
-        }
-
-        # ---------------- RESUME LOGIC ----------------
-        if resume_skipping:
-            if institute["Institute URL"] != last_processed_url:
+session = http_session(driver)
+
+# ⚡ browser pool: the list driver + extra instances (created here, uc.Chrome is not thread safe to start)
+browsers = [driver]
+drivers = Queue()
+drivers.put(driver)
+for _ in range(max(0, BROWSER_WORKERS - 1)):
+    extra = uc.Chrome(options=options)
+    browsers.append(extra)
+    drivers.put(extra)
+
+stats = {"http": 0, "browser": 0, "failed": 0}
+stats_lock = threading.Lock()
+
+
+def scrape(institute: dict) -> dict:
+    row = fetch_http(session, institute)
+    kind = "http"
+    if row is None:
+        row = fetch_browser(drivers, institute)
+        kind = "browser"
+    with stats_lock:
+        stats[kind] += 1
+    return row
+
+
+try:
+    with ThreadPoolExecutor(max_workers=HTTP_WORKERS, thread_name_prefix="irins") as pool:
+        futures = {pool.submit(scrape, i): i for i in todo}
+        for n, future in enumerate(as_completed(futures), 1):
+            institute = futures[future]
+            try:
+                row = future.result()
+            except Exception as e:
+                # not written → not in the done index → retried on the next run
+                stats["failed"] += 1
+                print(f"[FAIL] {institute['Institute Name']}: {e}")
                 continue
-            resume_skipping = False
-            continue
-
-        print(f"Scraping: {institute['Institute Name']}")
-
-        # --------------------------------------------------
-        # OPEN INSTITUTE PAGE
-        # --------------------------------------------------
-        driver.get(institute["Institute URL"])
-        time.sleep(3)
-
-        soup = BeautifulSoup(driver.page_source, "html.parser")
 
-        # ---------------- TOTAL FACULTY ----------------
-        total_f = soup.select_one("#total_f")
-        institute["Total Faculty / Scientist"] = int(total_f.text.strip()) if total_f else 0
+            # ✅ sink is written from this thread only
+            sink.write([row])
+            print(f"✔ [{n}/{len(todo)}] {institute['Institute Name']}")
+finally:
+    session.close()
+    for browser in browsers:
+        try:
+            browser.quit()
+        except Exception:
+            pass
 
-        # ---------------- TOTAL PUBLICATIONS ----------------
-        total_p = soup.select_one("#total_p")
-        institute["Total Publications"] = int(total_p.text.strip()) if total_p else 0
+print(f"[STATS] http={stats['http']} browser={stats['browser']} failed={stats['failed']}")
 
-        # ---------------- PUBLICATION BREAKUP (ALL) ----------------
-        for li in soup.select("ul.reseacher-box-ul li"):
-            label = li.contents[0].strip()
-            count = int(li.find("span", class_="counter-home").text.strip())
-            institute[label] = count
-
-        # ---------------- TOTAL PATENTS ----------------
-        total_patent = soup.select_one("#total_patent")
-        institute["Total Patents"] = int(total_patent.text.strip()) if total_patent else 0
-
-        # ---------------- IMPACT / CITATIONS ----------------
-        institute["Google Scholar Citations"] = 0
-        institute["Scopus Citations"] = 0
-
-        impact_block = soup.select_one("div.service-block-v3.service-block-sea")
-        if impact_block:
-            counters = impact_block.select("span.counter")
-            if len(counters) >= 2:
-                institute["Google Scholar Citations"] = int(counters[0].text.strip())
-                institute["Scopus Citations"] = int(counters[1].text.strip())
-
-        # --------------------------------------------------
-        # SAVE TO EXCEL + CHECKPOINT
-        # --------------------------------------------------
-        all_rows.append(institute)
-        pd.DataFrame(all_rows).fillna(0).to_excel(OUTPUT_FILE, index=False)
-
-        with open(CHECKPOINT_FILE, "w") as f:
-            f.write(institute["Institute URL"])
-
-        print("✔ Saved")
-
-        driver.back()
-        time.sleep(2)
-
-    # --------------------------------------------------
-    # NEXT PAGE
-    # --------------------------------------------------
-    try:
-        next_btn = driver.find_element(By.ID, "orgTable_next")
-        if "disabled" in next_btn.get_attribute("class"):
-            break
-        next_btn.click()
-        time.sleep(3)
-    except:
-        break
-
-driver.quit()
+# --------------------------------------------------
+# WRITE EXCEL ONCE
+# --------------------------------------------------
+df = pd.DataFrame(sink.read()).fillna(0)
+write_excel(df.to_dict("records"), OUTPUT_FILE, dedupe=False)
 
 print("\n✅ COMPLETED ALL PAGES SUCCESSFULLY")
 print(f"📄 Output file: {OUTPUT_FILE}")
@@ -1,13 +1,29 @@
 
 # open the MAKAUT affiliated college list page and scrape the data into an excel file with columns: College Code, College Name, College Website URL
+import sys
+from pathlib import Path
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scrapers.table_extract import Column, TableSpec, read_tables, to_frame
 
 URL = "https://makautwb.ac.in/page.php?id=363"
 
+# whole table in one execute_script (scrapers/table_extract.py)
+TABLE = TableSpec(
+    columns={
+        "Sr No": Column(0),
+        "College Code": Column(1),
+        # anchor text, plain cell text when the college has no link
+        "College Name": Column(2, "link_text", fallback="text", join_lines=True),
+        "College Website URL": Column(2, "href"),
+    },
+    min_cells=3,
+)
+
 # ---------- Chrome Options ----------
 options = uc.ChromeOptions()
 options.add_argument("--headless=new")
@@ -19,48 +35,19 @@ options.add_argument("--disable-dev-shm-usage")
 driver = uc.Chrome(options=options)
 wait = WebDriverWait(driver, 30)
 
-data = []
-
 try:
     driver.get(URL)
 
     # Wait for table body
-    tbody = wait.until(
+    wait.until(
         EC.presence_of_element_located((By.TAG_NAME, "tbody"))
     )
 
-    rows = tbody.find_elements(By.TAG_NAME, "tr")
-
-    for row in rows:
-        cols = row.find_elements(By.TAG_NAME, "td")
-        if len(cols) < 3:
-            continue
-
-        sr_no = cols[0].text.strip()
-        college_code = cols[1].text.strip()
-
-        college_name = ""
-        college_url = ""
-
-        # College Name + URL handling
-        try:
-            anchor = cols[2].find_element(By.TAG_NAME, "a")
-            college_name = anchor.text.replace("\n", " ").strip()
-            college_url = anchor.get_attribute("href")
-        except:
-            # No anchor tag
-            college_name = cols[2].text.replace("\n", " ").strip()
-            college_url = ""
-
-        data.append({
-            "Sr No": sr_no,
-            "College Code": college_code,
-            "College Name": college_name,
-            "College Website URL": college_url
-        })
+    # first tbody = college list
+    rows = read_tables(driver, "tbody", "tr")[0]
 
     # ---------- Save to Excel ----------
-    df = pd.DataFrame(data)
+    df = to_frame(rows, TABLE)
     df.to_excel("MAKAUT_College_List.xlsx", index=False)
 
     print("✅ Scraping completed successfully")
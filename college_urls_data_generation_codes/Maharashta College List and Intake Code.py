@@ -7,18 +7,48 @@ https://fe2025.mahacet.org/StaticPages/frmInstituteList?did=1884
 Follow each institute link like:
 frmInstituteSummary.aspx?InstituteCode=01002
 
+- summary pages are fetched concurrently (MAX_WORKERS threads, one pooled
+  session), paced per domain by utils.domain_health (AIMD rate, backs off on
+  errors / 429) instead of a fixed sleep
+- raw HTML goes to a gzip cache on disk, one file per InstituteCode
+  (SUMMARY_CACHE_DIR/<code>.html.gz); re-runs parse from the cache and only
+  fetch what is missing (REFETCH = True ignores the cache)
+- every page is parsed into structured fields as soon as it arrives and the
+  HTML is dropped, so memory stays flat:
+      Summaries : visible text of the page (SummaryText, as before), key /
+                  value fields (status, address, ...), course count, summed
+                  intake, courses as text
+      Courses   : one row per course table row
+
 Write results into Excel: institutes.xlsx
 """
 
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+import gzip
+import os
+import re
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 from urllib.parse import urljoin
 
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from utils.domain_health import DomainHealth, parse_retry_after
+
 BASE_PAGE = "https://fe2025.mahacet.org/StaticPages/frmInstituteList?did=1884"
 BASE_ROOT = "https://fe2025.mahacet.org/StaticPages/"
 
+OUT_FILE = "institutes.xlsx"
+SUMMARY_CACHE_DIR = Path("summary_cache")
+MAX_WORKERS = 8
+THROTTLE_STATUS = {429, 503}
+REFETCH = False
+
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; InstituteScraper/1.0; +https://example.com/bot)"
 }
@@ -91,30 +121,160 @@ def parse_list_table(soup):
 
     return rows_out
 
-def fetch_summary_text(url, session):
-    """
-    Fetch the summary page and return short cleaned text + raw_html.
-    If the page contains structured fields, you could extend parsing here.
-    """
-    if not url:
-        return {"summary_text": "", "raw_html": ""}
+# ---------------- SUMMARY CACHE (gzip, one file per InstituteCode) ----------------
+
+def cache_path(code):
+    safe = re.sub(r"[^A-Za-z0-9_-]", "_", code or "")
+    return SUMMARY_CACHE_DIR / f"{safe}.html.gz"
 
+def read_cached(code):
+    path = cache_path(code)
+    if REFETCH or not path.exists():
+        return None
     try:
-        soup = get_soup(url, session)
-    except Exception as e:
-        return {"summary_text": f"ERROR: {e}", "raw_html": ""}
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return f.read()
+    except (OSError, EOFError, UnicodeDecodeError):
+        return None   # broken / partial file → fetch again
+
+def write_cached(code, html):
+    path = cache_path(code)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        f.write(html)
+    os.replace(tmp, path)
+
+# ---------------- SUMMARY FETCH ----------------
+
+def make_session(workers=MAX_WORKERS):
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def fetch_summary_html(url, session, health, retry=3):
+    """Summary page HTML, paced by the domain's rate; raises the last error after `retry` attempts."""
+    error = None
+    for attempt in range(max(1, retry)):
+        time.sleep(health.delay(url))   # DomainOpen → the site is down, give up at once
+        try:
+            r = session.get(url, timeout=20)
+        except requests.RequestException as e:
+            health.failure(url)
+            error = e
+            continue
+
+        if r.status_code in THROTTLE_STATUS:
+            health.throttled(url, parse_retry_after(r.headers.get("Retry-After")))
+        elif r.status_code >= 500:
+            health.failure(url)
+        else:
+            health.success(url)
+            r.raise_for_status()
+            return r.text
+
+        error = requests.HTTPError(f"HTTP {r.status_code} for url: {url}", response=r)
+    raise error
+
+# ---------------- SUMMARY PARSING ----------------
+
+def _own_rows(table):
+    """<tr> of this table only (not of tables nested in it)."""
+    return [tr for tr in table.find_all("tr") if tr.find_parent("table") is table]
 
-    # collapse visible text
-    # remove script/style
+def _cells(tr):
+    """Cell texts of the row; layout cells holding a nested table are left out."""
+    return [
+        c.get_text(" ", strip=True) for c in tr.find_all(["td", "th"])
+        if c.find_parent("tr") is tr and not c.find("table")
+    ]
+
+def _to_int(text):
+    digits = re.sub(r"[^\d]", "", text or "")
+    return int(digits) if digits else 0
+
+def _course_table(rows):
+    """Header index + rows if this is a course / intake grid, else None."""
+    for i, cells in enumerate(rows):
+        lowered = [c.lower() for c in cells]
+        if any("intake" in c for c in lowered) and any("course" in c or "choice" in c or "branch" in c for c in lowered):
+            return i, cells
+    return None
+
+def parse_summary(html):
+    """
+    Summary page → (text, fields, courses)
+    text    : visible text of the page (scripts / styles removed)
+    fields  : {label: value} from the label / value rows of the page
+    courses : [{header: value}] from the table with course + intake columns
+    """
+    soup = BeautifulSoup(html, "html.parser")
     for tag in soup(["script", "style", "noscript"]):
         tag.decompose()
 
     text = " ".join(soup.stripped_strings)
-    # truncate extremely long text for Excel cell if needed, but we keep full text here
-    return {"summary_text": text, "raw_html": str(soup)}
+    fields = {}
+    courses = []
+
+    for table in soup.find_all("table"):
+        rows = [c for c in (_cells(tr) for tr in _own_rows(table)) if any(c)]
+        found = _course_table(rows)
+
+        if found:
+            start, header = found
+            for cells in rows[start + 1:]:
+                if len(cells) != len(header):
+                    continue   # totals / notes rows
+                courses.append(dict(zip(header, cells)))
+            continue
+
+        # label : value pairs (2 or 4 cells per row)
+        for cells in rows:
+            if len(cells) not in (2, 4):
+                continue
+            for label, value in zip(cells[::2], cells[1::2]):
+                label = label.strip().rstrip(":").strip()
+                if label and len(label) <= 60 and label not in fields:
+                    fields[label] = value
+
+    return text, fields, courses
+
+def summarize(inst, html):
+    """One Summaries row + the Courses rows of an institute."""
+    code = inst.get("InstituteCode")
+    text, fields, courses = parse_summary(html)
+
+    row = {"InstituteCode": code, "InstituteURL": inst.get("InstituteURL"), "SummaryText": text}
+    row.update({f"Summary {k}": v for k, v in fields.items()})
+
+    intake_col = next((h for h in (courses[0] if courses else {}) if "intake" in h.lower()), None)
+    name_col = next((h for h in (courses[0] if courses else {}) if "course" in h.lower() or "branch" in h.lower()), None)
+
+    row["CourseCount"] = len(courses)
+    row["SummaryIntake"] = sum(_to_int(c.get(intake_col)) for c in courses) if intake_col else ""
+    row["Courses"] = "; ".join(
+        f"{c.get(name_col, '')} ({c.get(intake_col, '')})" if intake_col else c.get(name_col, "")
+        for c in courses
+    ) if name_col else ""
+
+    course_rows = [{"InstituteCode": code, **c} for c in courses]
+    return row, course_rows
+
+def load_summary(inst, session, health):
+    """Cache first, network otherwise → (summary row, course rows, from_cache)."""
+    code = inst.get("InstituteCode")
+    html = read_cached(code)
+    cached = html is not None
+    if not cached:
+        html = fetch_summary_html(inst["InstituteURL"], session, health)
+        write_cached(code, html)
+    row, course_rows = summarize(inst, html)
+    return row, course_rows, cached
 
 def main():
-    session = requests.Session()
+    session = make_session()
 
     print("Fetching list page:", BASE_PAGE)
     soup_list = get_soup(BASE_PAGE, session)
@@ -125,36 +285,60 @@ def main():
         print("No rows found in table. Exiting.")
         return
 
-    print(f"Found {len(institutes)} institutes. Fetching individual summaries (may take a while)...")
+    SUMMARY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    health = DomainHealth()
+
+    print(f"Found {len(institutes)} institutes. Fetching summaries ({MAX_WORKERS} workers, cache: {SUMMARY_CACHE_DIR})...")
 
-    # We'll collect summary results in a list
+    # only parsed rows are kept; raw HTML lives in the cache, and every future
+    # is dropped once its rows are collected
     summaries = []
-    for i, inst in enumerate(institutes, start=1):
-        code = inst.get("InstituteCode")
-        url = inst.get("InstituteURL")
-        print(f"[{i}/{len(institutes)}] {code} -> {url or 'NO URL'}")
-        summary = fetch_summary_text(url, session) if url else {"summary_text": "", "raw_html": ""}
-        summaries.append({
-            "InstituteCode": code,
-            "InstituteURL": url,
-            "SummaryText": summary["summary_text"],
-            # raw html can be very large; include anyway in case user wants it
-            "SummaryHTML": summary["raw_html"][:1000000]  # cap to 1M chars to avoid memory blowup
-        })
-        # polite pause to avoid hammering server
-        time.sleep(0.5)
-
-    # convert to DataFrames
+    courses = []
+    stats = {"cached": 0, "fetched": 0, "failed": 0}
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        futures = {}
+        for inst in institutes:
+            if inst.get("InstituteURL"):
+                futures[pool.submit(load_summary, inst, session, health)] = inst
+            else:
+                summaries.append({"InstituteCode": inst.get("InstituteCode"), "InstituteURL": "", "SummaryText": ""})
+
+        total = len(futures)
+        for i, future in enumerate(as_completed(futures), start=1):
+            inst = futures.pop(future)
+            code = inst.get("InstituteCode")
+            try:
+                row, course_rows, cached = future.result()
+            except Exception as e:
+                # not cached → fetched again on the next run
+                stats["failed"] += 1
+                summaries.append({"InstituteCode": code, "InstituteURL": inst.get("InstituteURL"), "SummaryText": f"ERROR: {e}"})
+                print(f"[{i}/{total}] {code} -> ERROR: {e}")
+                continue
+
+            stats["cached" if cached else "fetched"] += 1
+            summaries.append(row)
+            courses.extend(course_rows)
+            print(f"[{i}/{total}] {code} -> {len(course_rows)} course(s){' (cache)' if cached else ''}")
+
+    print(f"Summaries: fetched {stats['fetched']}, from cache {stats['cached']}, failed {stats['failed']}")
+
+    # convert to DataFrames (list order, not completion order)
+    order = {inst.get("InstituteCode"): n for n, inst in enumerate(institutes)}
     df_list = pd.DataFrame(institutes)
-    df_summ = pd.DataFrame(summaries)
+    df_summ = pd.DataFrame(sorted(summaries, key=lambda r: order.get(r["InstituteCode"], len(order))))
+    df_courses = pd.DataFrame(courses)
+    if not df_courses.empty:
+        df_courses = df_courses.sort_values("InstituteCode", key=lambda s: s.map(order), kind="stable")
 
-    out_file = "institutes.xlsx"
-    print("Writing to Excel:", out_file)
-    with pd.ExcelWriter(out_file, engine="openpyxl") as writer:
+    print("Writing to Excel:", OUT_FILE)
+    with pd.ExcelWriter(OUT_FILE, engine="openpyxl") as writer:
         df_list.to_excel(writer, sheet_name="InstituteList", index=False)
         df_summ.to_excel(writer, sheet_name="Summaries", index=False)
+        df_courses.to_excel(writer, sheet_name="Courses", index=False)
 
-    print("Done. Output file:", out_file)
+    print("Done. Output file:", OUT_FILE)
 
 if __name__ == "__main__":
     main()
@@ -1,13 +1,28 @@
 #open the browser and go to the Sarvajanik University Surat colleges page and scrape the list of colleges along with their categories and URLs, then save the data to an Excel file.
+import sys
+from pathlib import Path
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import pandas as pd
-import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scrapers.table_extract import Column, TableSpec, read_tables, to_frame
 
 URL = "https://www.ses-surat.org/pages/colleges/"
 
+# whole table in one execute_script (scrapers/table_extract.py):
+# "active" rows are category headings, every other row needs a link
+TABLE = TableSpec(
+    columns={
+        "College Name": Column(None, "link_text"),
+        "URL": Column(None, "href"),
+    },
+    section_class="active",
+    section_column="Category",
+    required=("URL",),
+)
+
 # ---------- Chrome Options ----------
 options = uc.ChromeOptions()
 options.add_argument("--headless=new")   # headless
@@ -25,34 +40,11 @@ try:
     # wait for table
     wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table.table")))
 
-    rows = driver.find_elements(By.CSS_SELECTOR, "table.table tbody tr")
-
-    data = []
-    current_category = None
-
-    for row in rows:
-        # Category row
-        if "active" in row.get_attribute("class"):
-            current_category = row.text.strip()
-            continue
-
-        # College rows
-        try:
-            link = row.find_element(By.TAG_NAME, "a")
-            college_name = link.text.strip()
-            college_url = link.get_attribute("href")
-
-            data.append({
-                "Category": current_category,
-                "College Name": college_name,
-                "URL": college_url
-            })
-
-        except:
-            continue
+    # rows of every "table.table", in page order
+    rows = [row for table in read_tables(driver, "table.table", "tbody tr") for row in table]
 
     # ---------- Save to Excel ----------
-    df = pd.DataFrame(data)
+    df = to_frame(rows, TABLE)
     df.to_excel("SES_Surat_Colleges.xlsx", index=False)
 
     print("✅ Scraping completed. File saved as SES_Surat_Colleges.xlsx")
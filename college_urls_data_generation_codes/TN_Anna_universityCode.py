@@ -1,9 +1,12 @@
 #Open and scrape data from the Anna University TN government engineering colleges page using undetected-chromedriver and Selenium.
 
+import sys
+from pathlib import Path
 import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-import pandas as pd
-import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scrapers.datatables import harvest_datatable, header_spec, wait_for_datatable
+from scrapers.table_extract import to_frame
 
 # ----------------------------------
 # UNDETECTED + HEADLESS OPTIONS
@@ -21,42 +24,18 @@ driver = uc.Chrome(options=options, use_subprocess=True)
 url = "https://dte.tn.gov.in/government-engineering"
 
 driver.get(url)
-time.sleep(5)  # allow DataTable JS to initialize
-
-# ----------------------------------
-# GET HEADERS
-# ----------------------------------
-headers = [
-    th.text.strip()
-    for th in driver.find_elements(By.CSS_SELECTOR, "#dtable thead th")
-]
-
-print("Headers Found:", headers)
 
-all_rows = []
+# DataTable initialised (no fixed sleep)
+wait_for_datatable(driver, "#dtable")
 
 # ----------------------------------
-# GET TOTAL PAGES (DataTables API)
+# WHOLE DATASET IN ONE CALL (DataTables API, no paging)
 # ----------------------------------
-total_pages = driver.execute_script("""
-    return $('#dtable').DataTable().page.info().pages;
-""")
+data = harvest_datatable(driver, "#dtable")
+headers = data["headers"]
 
-print("Total Pages:", total_pages)
-
-# ----------------------------------
-# PAGINATION USING JS API (BEST WAY)
-# ----------------------------------
-for page in range(total_pages):
-    driver.execute_script(f"""
-        $('#dtable').DataTable().page({page}).draw('page');
-    """)
-    time.sleep(1)
-
-    rows = driver.find_elements(By.CSS_SELECTOR, "#dtable tbody tr")
-    for row in rows:
-        cols = row.find_elements(By.TAG_NAME, "td")
-        all_rows.append([c.text.strip() for c in cols])
+print("Headers Found:", headers)
+print("Rows Found:", len(data["rows"]))
 
 # ----------------------------------
 # CLEAN EXIT (NO WinError 6)
@@ -67,7 +46,7 @@ driver.quit()
 # ----------------------------------
 # SAVE TO EXCEL
 # ----------------------------------
-df = pd.DataFrame(all_rows, columns=headers)
+df = to_frame(data["rows"], header_spec(headers), headers=headers)
 df.to_excel("TN_Government_Engineering_Colleges.xlsx", index=False)
 
 print("✅ Scraping completed successfully")
@@ -1,12 +1,18 @@
 """
-selenium_check_urls.py
+eduValidUrlChecking.py
 
 What it does:
 - Reads input CSV/Excel (auto-detects 'URL' column, case-insensitive)
-- For each URL:
-    1) Try a requests.get() with a short timeout to check basic HTTP status
-    2) If requests is OK (status < 400) OR if requests fails, attempt to open in Chrome using Selenium
-    3) If Selenium loads page and document.readyState == 'complete', mark as "valid", else "invalid"
+- Validates every URL in two stages:
+    1) HTTP stage (all URLs at once): DNS + GET through utils/preflight.py
+       (thread pool, pooled keep-alive connections, results cached with a TTL)
+         - host does not resolve          -> "invalid" (no browser needed)
+         - HTTP answer < 400              -> "valid"   (no browser needed)
+         - anything else (4xx / 5xx, timeout, TLS / connection error,
+           no answer during a local network outage) -> ambiguous
+    2) Browser stage (ambiguous URLs only): BROWSER_WORKERS headless Chrome
+       sessions (Selenium) in parallel; document.readyState == 'complete'
+       -> "valid", else "invalid" (same waits as before)
 - Writes output to CSV and Excel with an added 'status' column.
 
 Requirements:
@@ -14,33 +20,29 @@ pip install pandas requests selenium webdriver-manager openpyxl
 Also ensure Chrome is installed on the machine.
 
 Run:
-python selenium_check_urls.py
+python eduValidUrlChecking.py
 """
 
 """
-selenium_check_urls_with_checkpoint.py
-
-Selenium + requests URL validator with robust checkpointing/resume.
-
-How it resumes:
-- If OUTPUT_CSV exists, the script loads it and continues from the first row whose 'status'
-  is empty (or missing). Each processed row is saved immediately so a crash/restart will
-  continue without re-processing already-done rows.
-
-Requirements:
-pip install pandas requests selenium webdriver-manager openpyxl
-Chrome must be installed.
-
-Run:
-python selenium_check_urls_with_checkpoint.py
+Checkpointing / resume:
+- Every finished URL is appended to CHECKPOINT_LOG (one JSON line, flush +
+  fsync), instead of rewriting the whole CSV after every row.
+- On restart the log is read back and only URLs without a result are
+  checked again (a half-written last line is ignored). The same URL on
+  several rows is checked once.
+- OUTPUT_CSV / OUTPUT_XLSX are written once at the end (also after a crash
+  or Ctrl+C, from whatever is in the log).
 """
 
 import os
+import sys
 import time
 import json
+import queue
 import tempfile
+import threading
+from pathlib import Path
 import pandas as pd
-import requests
 from selenium import webdriver
 from selenium.common.exceptions import WebDriverException, TimeoutException, InvalidArgumentException
 from selenium.webdriver.chrome.service import Service as ChromeService
@@ -49,14 +51,25 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from utils.domain_health import DomainHealth, DomainOpen, is_network_error
+from utils.preflight import DNS_FAILED, INVALID, PreflightCache, run_preflight
+
 # === CONFIG - adjust to your environment ===
 INPUT_PATH = r"D:\Education - Valid Url\IRINS Dashboard.csv"
 OUTPUT_CSV = r"D:\Education - Valid Url\IRINS_Dashboard_with_status.csv"
 OUTPUT_XLSX = r"D:\Education - Valid Url\IRINS_Dashboard_with_status.xlsx"
-CHECKPOINT_JSON = r"D:\Education - Valid Url\IRINS_Dashboard_checkpoint.json"
+CHECKPOINT_LOG = r"D:\Education - Valid Url\IRINS_Dashboard_checkpoint.jsonl"
+
+# HTTP stage (utils/preflight.py): URLs probed at the same time
+HTTP_WORKERS = 32
+PREFLIGHT_CACHE_FILE = r"D:\Education - Valid Url\preflight.json"   # None → no cache
 
-# Selenium / network timeouts
-REQUESTS_TIMEOUT = 8
+# Browser stage: headless Chrome sessions running at the same time
+BROWSER_WORKERS = 4
+HEADLESS = True
+
+# Selenium timeouts
 SELENIUM_PAGE_LOAD_TIMEOUT = 30
 SELENIUM_WAIT_SHORT = 10
 SELENIUM_WAIT_LONG = 45
@@ -64,14 +77,26 @@ SELENIUM_MAX_WAIT_PER_URL = 70
 BODY_MIN_LENGTH = 20
 EXTRA_JS_SETTLE = 1.0
 
-# Checkpointing / saving control
-# If AUTOSAVE_EVERY == 1 -> save after each URL (most robust). Increase to reduce disk writes.
-AUTOSAVE_EVERY = 1
 # If True, script will ignore existing output and start fresh (useful for debugging)
 FORCE_RESTART = False
 
+# Per-domain health (utils/domain_health.py): paces requests per domain, skips
+# domains that keep timing out (instead of ~80 s per URL) and honours
+# 429 / Retry-After. Point it at the crawler's file to share what it learned.
+DOMAIN_HEALTH_FILE = r"D:\Education - Valid Url\domain_health.json"   # None → this run only
+HEALTH = DomainHealth(DOMAIN_HEALTH_FILE)
+
 # === helper functions ===
 
+def to_url(raw):
+    return raw if raw.lower().startswith(("http://", "https://")) else "http://" + raw
+
+def url_values(df, url_col):
+    return [str(v).strip() for v in df[url_col].tolist()]
+
+def is_empty_url(raw):
+    return not raw or raw.lower() in ("nan", "none")
+
 def atomic_write_csv(df, path):
     """Write DataFrame to disk atomically using a temp file + replace."""
     dirn = os.path.dirname(path) or "."
@@ -89,21 +114,6 @@ def atomic_write_csv(df, path):
             except Exception:
                 pass
 
-def save_checkpoint_meta(meta, path):
-    tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(meta, f)
-    os.replace(tmp, path)
-
-def load_checkpoint_meta(path):
-    if not os.path.exists(path):
-        return None
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return None
-
 def find_url_column(df):
     for col in df.columns:
         if col.strip().lower() in ("url", "link", "website"):
@@ -114,16 +124,94 @@ def find_url_column(df):
             return col
     raise ValueError("Could not find a URL column. Make sure there is a column named 'URL' or containing http(s) links.")
 
-def try_requests_head_or_get(url):
-    try:
-        r = requests.get(url, timeout=REQUESTS_TIMEOUT, allow_redirects=True, headers={
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0 Safari/537.36"
-        })
-        return True, r.status_code
-    except Exception as e:
-        return False, str(e)
+# === append-only checkpoint log ===
+
+class CheckpointLog:
+    """
+    One JSON line per finished URL: {"url", "status", "status_detail", "stage", "ts"}.
+    Thread safe (HTTP + browser workers write to it).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def load(self):
+        """url -> last result. A torn last line (crash mid-write) is skipped."""
+        done = {}
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(rec, dict) and rec.get("url"):
+                    done[rec["url"]] = rec
+        return done
+
+    def append(self, url, status, detail, stage):
+        rec = {"url": url, "status": status, "status_detail": detail, "stage": stage, "ts": time.time()}
+        line = json.dumps(rec, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a+", encoding="utf-8") as f:
+                # torn last line from a crashed run -> start on a fresh line
+                if f.tell() and not self._ends_with_newline():
+                    line = "\n" + line
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+        return rec
+
+    def _ends_with_newline(self):
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def reset(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+# === stage 1: HTTP ===
+
+def http_stage(urls, log, done):
+    """
+    Probe every URL concurrently. Definite answers are logged, the
+    ambiguous URLs are returned for the browser stage.
+    """
+    t0 = time.time()
+    cache = PreflightCache(PREFLIGHT_CACHE_FILE)
+    results = run_preflight(urls, cache, workers=HTTP_WORKERS)
+
+    ambiguous = []
+    for url in urls:
+        r = results.get(url)
+        if r is None:
+            ambiguous.append((url, "no_http_result"))
+            continue
+
+        if r["status"] in (DNS_FAILED, INVALID):
+            done[url] = log.append(url, "invalid", f"http_{r['status']}:{r['error']}", "http")
+        elif r["http_status"] is not None and r["http_status"] < 400:
+            HEALTH.success(url)
+            done[url] = log.append(url, "valid", f"http:{r['http_status']}; final_url:{r['final_url']}", "http")
+        else:
+            detail = f"http:{r['http_status']}" if r["http_status"] is not None else f"http_{r['status']}:{r['error']}"
+            ambiguous.append((url, detail))
+
+    print(
+        f"HTTP stage: {len(urls)} URL(s) in {time.time()-t0:.1f}s -> "
+        f"{len(urls) - len(ambiguous)} decided, {len(ambiguous)} for the browser"
+    )
+    return ambiguous
 
-def setup_driver(headless=False):
+# === stage 2: browser ===
+
+def setup_driver(driver_path, headless=HEADLESS):
     options = webdriver.ChromeOptions()
     if headless:
         options.add_argument("--headless=new")
@@ -134,7 +222,9 @@ def setup_driver(headless=False):
     options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0 Safari/537.36")
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option('useAutomationExtension', False)
-    service = ChromeService(ChromeDriverManager().install())
+    # images are not needed to decide if a page loads
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    service = ChromeService(driver_path)
     driver = webdriver.Chrome(service=service, options=options)
     driver.set_page_load_timeout(SELENIUM_PAGE_LOAD_TIMEOUT)
     return driver
@@ -186,6 +276,88 @@ def check_with_selenium(driver, url):
     else:
         return False, f"short_wait_failed_and_no_time_for_long_wait; detail={detail}; elapsed={elapsed:.1f}s"
 
+def check_in_browser(driver, url, http_detail):
+    """-> (status, status_detail) of one ambiguous URL."""
+    try:
+        time.sleep(HEALTH.delay(url))
+    except DomainOpen as e:
+        # circuit open -> no browser timeout burnt on it
+        return "invalid", f"domain_down:{e}; {http_detail}"
+
+    selenium_ok, detail = check_with_selenium(driver, url)
+    if selenium_ok:
+        HEALTH.success(url)
+        return "valid", f"selenium:{detail}; {http_detail}"
+    if is_network_error(detail):
+        HEALTH.failure(url)
+    return "invalid", f"selenium_error:{detail}; {http_detail}"
+
+def browser_stage(ambiguous, log, done):
+    if not ambiguous:
+        return
+
+    t0 = time.time()
+    jobs = queue.Queue()
+    for item in ambiguous:
+        jobs.put(item)
+
+    driver_path = ChromeDriverManager().install()   # once, not per worker
+    finished = [0]
+    count_lock = threading.Lock()
+
+    def worker(n):
+        try:
+            driver = setup_driver(driver_path)
+        except Exception as e:
+            print(f"[browser {n}] could not start Chrome: {e}")
+            return
+        try:
+            while True:
+                try:
+                    url, http_detail = jobs.get_nowait()
+                except queue.Empty:
+                    return
+                status, detail = check_in_browser(driver, url, http_detail)
+                done[url] = log.append(url, status, detail, "browser")
+                with count_lock:
+                    finished[0] += 1
+                    k = finished[0]
+                print(f"[browser {n}] ({k}/{len(ambiguous)}) {url} -> {status} ({detail[:120]})")
+        finally:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    threads = [
+        threading.Thread(target=worker, args=(n,), name=f"browser-{n}", daemon=True)
+        for n in range(max(1, min(BROWSER_WORKERS, len(ambiguous))))
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    print(f"Browser stage: {finished[0]}/{len(ambiguous)} URL(s) in {time.time()-t0:.1f}s")
+
+# === output ===
+
+def build_output(original_df, url_col, done):
+    df = original_df.copy()
+    status, detail = [], []
+    for raw in url_values(df, url_col):
+        if is_empty_url(raw):
+            status.append("invalid")
+            detail.append("empty url")
+            continue
+        rec = done.get(to_url(raw))
+        status.append(rec["status"] if rec else "")
+        detail.append(rec["status_detail"] if rec else "")
+
+    df["status"] = status
+    df["status_detail"] = detail
+    return df
+
 # === main flow with resume logic ===
 
 def main():
@@ -195,149 +367,46 @@ def main():
     else:
         original_df = pd.read_csv(INPUT_PATH)
 
-    # Normalize: work with a reset integer index to avoid index mismatch on resume
     original_df = original_df.reset_index(drop=True)
 
-    # Ensure URL column detection before anything else
     url_col = find_url_column(original_df)
     print(f"Detected URL column: '{url_col}'")
 
-    # Prepare working dataframe (copy original and ensure status columns exist)
+    log = CheckpointLog(CHECKPOINT_LOG)
     if FORCE_RESTART:
-        # delete any old outputs/checkpoints to force restart
+        log.reset()
         if os.path.exists(OUTPUT_CSV):
             os.remove(OUTPUT_CSV)
-        if os.path.exists(CHECKPOINT_JSON):
-            os.remove(CHECKPOINT_JSON)
-
-    if os.path.exists(OUTPUT_CSV):
-        try:
-            prev = pd.read_csv(OUTPUT_CSV)
-            prev = prev.reset_index(drop=True)
-            # If prev has same columns as original (or at least URL column), merge status back into working df
-            if url_col in prev.columns:
-                # build new df that has original columns plus status columns from prev where urls match at same index
-                # easiest approach: if sizes match, use prev as base; otherwise merge by URL content
-                if len(prev) == len(original_df):
-                    df = prev.copy()
-                    print("Loaded existing output CSV and resuming by index.")
-                else:
-                    # merge by URL content to preserve processed rows even if order changed
-                    merged = original_df.copy()
-                    merged["__orig_index__"] = merged.index
-                    prev_subset = prev[[url_col, "status", "status_detail"]] if "status" in prev.columns else prev[[url_col]]
-                    merged = merged.merge(prev_subset, on=url_col, how="left", suffixes=("", "_prev"))
-                    # prefer status from prev (if present); ensure columns exist
-                    if "status" not in merged.columns:
-                        merged["status"] = merged.get("status_prev")
-                    if "status_detail" not in merged.columns:
-                        merged["status_detail"] = merged.get("status_detail_prev")
-                    merged = merged.drop(columns=[c for c in merged.columns if c.endswith("_prev")])
-                    merged = merged.drop(columns=["__orig_index__"], errors="ignore")
-                    df = merged
-                    print("Merged existing output CSV by URL and will resume unprocessed rows.")
-            else:
-                # cannot merge; start fresh but warn
-                print("Existing output CSV doesn't contain detected URL column; ignoring it and starting fresh.")
-                df = original_df.copy()
-                df["status"] = ""
-                df["status_detail"] = ""
-        except Exception as e:
-            print("Could not read existing output CSV (will start fresh). Error:", e)
-            df = original_df.copy()
-            df["status"] = ""
-            df["status_detail"] = ""
-    else:
-        # no existing output => create new df with status columns
-        df = original_df.copy()
-        df["status"] = ""
-        df["status_detail"] = ""
-
-    # locate first unprocessed row
-    def is_unprocessed(val):
-        return (pd.isna(val)) or (str(val).strip() == "")
-
-    try:
-        first_unprocessed = next(i for i, v in enumerate(df["status"].tolist()) if is_unprocessed(v))
-    except StopIteration:
-        print("All rows already processed in output. Exiting.")
-        # still save to xlsx to ensure final excel exists
-        try:
-            df.to_excel(OUTPUT_XLSX, index=False)
-        except Exception:
-            pass
-        return
 
-    print(f"Resuming from row index: {first_unprocessed} / {len(df)-1}")
+    done = log.load()
 
-    # start Selenium driver
-    driver = setup_driver(headless=False)
-
-    # load checkpoint meta if present
-    meta = load_checkpoint_meta(CHECKPOINT_JSON) or {}
-    meta.setdefault("last_processed_index", None)
-    processed_since_save = 0
+    urls = list(dict.fromkeys(
+        to_url(raw)
+        for raw in url_values(original_df, url_col)
+        if not is_empty_url(raw)
+    ))
+    pending = [u for u in urls if u not in done]
+    print(f"{len(urls)} distinct URL(s), {len(urls) - len(pending)} already in the checkpoint log, {len(pending)} to check")
 
+    t0 = time.time()
     try:
-        for idx in range(first_unprocessed, len(df)):
-            raw = str(df.at[idx, url_col]).strip()
-            if not raw or raw.lower() in ("nan", "none", ""):
-                df.at[idx, "status"] = "invalid"
-                df.at[idx, "status_detail"] = "empty url"
-                print(f"[{idx}] empty -> invalid")
-            else:
-                url = raw if raw.lower().startswith(("http://", "https://")) else "http://" + raw
-
-                ok_req, req_info = try_requests_head_or_get(url)
-                req_ok_flag = False
-                if ok_req and isinstance(req_info, int):
-                    req_ok_flag = (req_info < 400)
-
-                selenium_ok, detail = check_with_selenium(driver, url)
-
-                if selenium_ok:
-                    df.at[idx, "status"] = "valid"
-                    df.at[idx, "status_detail"] = f"selenium:{detail}; requests_ok:{req_ok_flag}"
-                    print(f"[{idx}] {url} -> valid ({detail})")
-                else:
-                    df.at[idx, "status"] = "invalid"
-                    df.at[idx, "status_detail"] = f"selenium_error:{detail}; requests_ok:{req_ok_flag}"
-                    print(f"[{idx}] {url} -> invalid ({detail})")
-
-            # update checkpoint meta
-            meta["last_processed_index"] = idx
-            processed_since_save += 1
-
-            # Save after every AUTOSAVE_EVERY rows (set AUTOSAVE_EVERY=1 to save each row)
-            if processed_since_save >= AUTOSAVE_EVERY:
-                try:
-                    # atomic write of CSV
-                    atomic_write_csv(df, OUTPUT_CSV)
-                    # also save small JSON meta
-                    save_checkpoint_meta(meta, CHECKPOINT_JSON)
-                    print(f"Checkpoint saved at row {idx} -> {OUTPUT_CSV}")
-                except Exception as e:
-                    print("Warning: failed to save checkpoint:", e)
-                processed_since_save = 0
-
+        if pending:
+            ambiguous = http_stage(pending, log, done)
+            browser_stage(ambiguous, log, done)
     finally:
-        try:
-            driver.quit()
-        except Exception:
-            pass
+        HEALTH.sync()
 
-        # final save
+        # final save (also after a crash: everything in the log is kept)
         try:
+            df = build_output(original_df, url_col, done)
             atomic_write_csv(df, OUTPUT_CSV)
-            # save final xlsx as well
             df.to_excel(OUTPUT_XLSX, index=False)
-            meta["last_processed_index"] = meta.get("last_processed_index", None)
-            save_checkpoint_meta(meta, CHECKPOINT_JSON)
-            print("Final results saved.")
+            counts = df["status"].replace("", "unchecked").value_counts().to_dict()
+            print(f"Final results saved: {counts}")
         except Exception as e:
             print("Error saving final results:", e)
 
-    print("Done.")
+    print(f"Done in {time.time()-t0:.1f}s.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,139 @@
+"""
+crawl_workers.py
+
+Run the college crawler of links_extracted_from_college.ipynb as many worker
+processes, all pulling colleges from one shared lease queue (utils/lease_queue.py).
+
+- The notebook code cells are loaded as they are (no copy of the crawler here).
+- The first process seeds the queue from the Excel list (safe to repeat),
+  minus the hosts the pre-flight (utils/preflight.py) finds dead.
+- Every process claims one college at a time; a crashed process's college is
+  picked up again once its lease expires.
+- Start the same command on every machine that can see the queue file.
+
+Run (from the repo root):
+    python -m scrapers.crawl_workers \
+        --excel college_urls_data/Engineering_Colleges_2875_valid_URL.xlsx \
+        --queue /shared/crawl_queue.sqlite
+
+    # extra machines, queue already seeded:
+    python -m scrapers.crawl_workers --queue /shared/crawl_queue.sqlite
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+NOTEBOOK_PATH = REPO_ROOT / "links_extracted_from_college.ipynb"
+
+
+def load_notebook_namespace(notebook_path: Path, overrides: dict) -> dict:
+    """
+    Execute the notebook's code cells into a fresh namespace.
+    - shell / magic lines (!pip, %time) are dropped
+    - cells with top-level `await` (the "run" cells) are skipped
+    - `overrides` are re-applied after every cell, so later cells
+      (e.g. default arguments) already see them
+    """
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+
+    with open(notebook_path, "r", encoding="utf-8") as f:
+        nb = json.load(f)
+
+    ns = {"__name__": "crawler_notebook"}
+
+    for cell in nb["cells"]:
+        if cell.get("cell_type") != "code":
+            continue
+
+        src = "".join(
+            line for line in cell["source"]
+            if not line.lstrip().startswith(("!", "%"))
+        )
+
+        try:
+            code = compile(src, notebook_path.name, "exec")
+        except SyntaxError:
+            continue
+
+        exec(code, ns)
+        ns.update(overrides)
+
+    return ns
+
+
+def worker_process(overrides: dict, max_concurrent: int | None):
+    os.chdir(REPO_ROOT)
+    ns = load_notebook_namespace(NOTEBOOK_PATH, overrides)
+
+    work_queue = ns["LeaseQueue"](overrides["WORK_QUEUE_DB"])
+    if max_concurrent is None:
+        max_concurrent = ns["MAX_CONCURRENT_COLLEGES"]
+
+    asyncio.run(ns["run_scraping_worker"](work_queue, max_concurrent=max_concurrent))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run crawler workers on a shared lease queue.")
+    parser.add_argument("--queue", required=True, help="SQLite queue file (shared by every worker / machine)")
+    parser.add_argument("--excel", help="college list to seed into the queue (skip on extra machines)")
+    parser.add_argument("--sheet", default="Sheet1")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                        help="worker processes on this machine (default: CPU count)")
+    parser.add_argument("--colleges-per-process", type=int, default=1,
+                        help="colleges crawled at the same time inside one process")
+    parser.add_argument("--headed", action="store_true", help="show the browser windows")
+    parser.add_argument("--seed-only", action="store_true", help="seed the queue and exit")
+    parser.add_argument("--no-preflight", action="store_true",
+                        help="seed every college, even hosts the DNS / HTTP pre-flight finds dead")
+    args = parser.parse_args()
+
+    overrides = {
+        "WORK_QUEUE_DB": str(Path(args.queue).resolve()),
+        "HEADLESS": not args.headed,
+    }
+
+    os.chdir(REPO_ROOT)
+
+    if args.excel:
+        overrides["EXCEL_INPUT_FILE"] = str(Path(args.excel).resolve())
+        overrides["SHEET_NAME"] = args.sheet
+
+        ns = load_notebook_namespace(NOTEBOOK_PATH, overrides)
+        colleges = ns["load_colleges_from_excel"](overrides["EXCEL_INPUT_FILE"], sheet_name=args.sheet)
+        if ns["PREFLIGHT"] and not args.no_preflight:
+            colleges = ns["preflight_colleges"](colleges)
+        ns["seed_work_queue"](ns["LeaseQueue"](overrides["WORK_QUEUE_DB"]), colleges)
+
+    if args.seed_only:
+        return
+
+    print(f"[INFO] Starting {args.processes} worker process(es) on {overrides['WORK_QUEUE_DB']}")
+
+    ctx = multiprocessing.get_context("spawn")
+    procs = [
+        ctx.Process(
+            target=worker_process,
+            args=(overrides, args.colleges_per_process),
+            name=f"crawl-worker-{i}",
+        )
+        for i in range(max(1, args.processes))
+    ]
+
+    for proc in procs:
+        proc.start()
+
+    for proc in procs:
+        proc.join()
+
+    print("[DONE] All worker processes exited.")
+
+
+if __name__ == "__main__":
+    main()
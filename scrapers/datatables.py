@@ -0,0 +1,165 @@
+"""
+datatables.py
+
+Whole-dataset harvester for jQuery DataTables tables (Selenium), used by the
+list builders in college_urls_data_generation_codes/ instead of clicking /
+drawing one page at a time with fixed sleeps.
+
+- wait_for_datatable(driver, selector) → waits (no fixed sleep) until the
+  DataTable is initialised and its first data is in
+- harvest_datatable(driver, selector) → ONE script call:
+    client-side table : every row straight from the API (rows in the
+                        current order / search), nothing is drawn
+    server-side table : the table's own ajax is driven page by page with a
+                        large page length, each next page requested on the
+                        previous draw event (no sleeps, no clicks)
+  Returns {"headers": [...], "rows": [...], "server_side": bool}. Rows have
+  the same shape as scrapers.table_extract.read_tables (visible columns
+  only): the real <tr> when DataTables created it, else the rendered
+  ("display") cell HTML parsed into text / first link.
+- header_spec(headers) → TableSpec with one text column per header (a
+  repeated / blank header gets its position appended, e.g. "Name_3"); any
+  other mapping can use Column("<header text>", ...) or a column index.
+
+Usage:
+    wait_for_datatable(driver, "#dtable")
+    data = harvest_datatable(driver, "#dtable")
+    df = to_frame(data["rows"], header_spec(data["headers"]), headers=data["headers"])
+"""
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from scrapers.table_extract import Column, TableSpec
+
+# ================= CONFIG =================
+
+INIT_TIMEOUT_SEC = 30
+HARVEST_TIMEOUT_SEC = 300
+SERVER_PAGE_LEN = 1000       # rows per ajax request (server-side tables)
+
+IS_READY_JS = """
+const $ = window.jQuery;
+if (!$ || !$.fn || !$.fn.dataTable || !$.fn.dataTable.isDataTable(arguments[0])) {
+    return false;
+}
+const settings = $(arguments[0]).DataTable().settings()[0];
+return !!(settings && settings._bInitComplete);
+"""
+
+HARVEST_JS = """
+const selector = arguments[0], pageLen = arguments[1];
+const done = arguments[arguments.length - 1];
+
+try {
+    const dt = window.jQuery(selector).DataTable();
+    const visible = dt.columns().indexes().toArray().filter((c) => dt.column(c).visible());
+    const headers = visible.map((c) => {
+        const th = dt.column(c).header();
+        return ((th && (th.innerText || th.textContent)) || "").trim();
+    });
+
+    const anchor = (el) => {
+        const a = el.querySelector("a[href]") || el.querySelector("a");
+        if (!a) return [null, null];
+        const raw = a.getAttribute("href");
+        let href = "";
+        try { href = raw ? new URL(raw, document.baseURI).href : ""; } catch (e) { href = raw || ""; }
+        return [a.innerText || a.textContent || "", href];
+    };
+
+    // rendered cell HTML (row without a <tr> yet) → text + first link
+    const parser = new DOMParser();
+    const fromHtml = (value) => {
+        const html = value === null || value === undefined ? "" : String(value);
+        const doc = parser.parseFromString("<body>" + html + "</body>", "text/html");
+        doc.querySelectorAll("br").forEach((br) => br.replaceWith("\\n"));
+        const [linkText, href] = anchor(doc.body);
+        return { text: doc.body.textContent || "", link_text: linkText, href: href };
+    };
+
+    const fromNode = (td) => {
+        const [linkText, href] = anchor(td);
+        return { text: td.innerText || td.textContent || "", link_text: linkText, href: href };
+    };
+
+    const readRow = (idx) => {
+        const tr = dt.row(idx).node();
+        if (tr) {
+            const [linkText, href] = anchor(tr);
+            return {
+                cls: (typeof tr.className === "string" ? tr.className : "") || "",
+                text: tr.innerText || tr.textContent || "",
+                link_text: linkText,
+                href: href,
+                cells: Array.from(tr.querySelectorAll(":scope > td")).map(fromNode),
+            };
+        }
+        const cells = visible.map((c) => fromHtml(dt.cell(idx, c).render("display")));
+        const linked = cells.find((cell) => cell.href) || { link_text: null, href: null };
+        return {
+            cls: "",
+            text: cells.map((cell) => cell.text).join("\\t"),
+            link_text: linked.link_text,
+            href: linked.href,
+            cells: cells,
+        };
+    };
+
+    if (!dt.page.info().serverSide) {
+        const rows = dt.rows({ order: "applied", search: "applied" }).indexes().toArray().map(readRow);
+        done({ headers: headers, rows: rows, server_side: false });
+    } else {
+        const rows = [];
+        const onDraw = () => {
+            dt.rows({ page: "current" }).indexes().toArray().forEach((i) => rows.push(readRow(i)));
+            const info = dt.page.info();
+            if (info.page + 1 >= info.pages || info.end >= info.recordsDisplay) {
+                dt.off("draw.harvest");
+                done({ headers: headers, rows: rows, server_side: true });
+            } else {
+                dt.page(info.page + 1).draw("page");
+            }
+        };
+        dt.on("draw.harvest", onDraw);
+        // new page length → ajax reload from the first page
+        dt.page.len(pageLen).draw();
+    }
+} catch (e) {
+    done({ error: String(e) });
+}
+"""
+
+
+class DataTablesError(Exception):
+    pass
+
+
+def wait_for_datatable(driver, selector: str, timeout: float = INIT_TIMEOUT_SEC):
+    WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+        lambda d: d.execute_script(IS_READY_JS, selector)
+    )
+
+
+def harvest_datatable(driver, selector: str, *, page_len: int = SERVER_PAGE_LEN, timeout: float = HARVEST_TIMEOUT_SEC) -> dict:
+    previous = driver.timeouts.script
+    driver.set_script_timeout(timeout)
+    try:
+        result = driver.execute_async_script(HARVEST_JS, selector, page_len)
+    finally:
+        # the driver is shared with the rest of the scraper
+        driver.set_script_timeout(previous)
+
+    if not isinstance(result, dict) or result.get("error"):
+        raise DataTablesError(f"DataTables harvest of {selector} failed: {(result or {}).get('error')}")
+    return result
+
+
+def header_spec(headers: list) -> TableSpec:
+    """Every column as text, named after its header (made unique)."""
+    columns = {}
+    for i, h in enumerate(headers):
+        name = h or "column"
+        if not h or name in columns:
+            name = f"{name}_{i}"
+        columns[name] = Column(i)
+    return TableSpec(columns=columns)
@@ -0,0 +1,178 @@
+"""
+table_extract.py
+
+Single-shot HTML table extraction for the list-builder scripts in
+college_urls_data_generation_codes/ (Selenium).
+
+Walking a table with find_elements and then .text / find_element /
+get_attribute per cell costs several WebDriver round trips per cell, plus a
+NoSuchElementException for every cell without a link. Here:
+
+- read_tables(driver, selector, row_selector) → ONE execute_script returns
+  every matched table as plain data:
+      row  : {"cls", "text", "link_text", "href", "cells": [cell, ...]}
+      cell : {"text", "link_text", "href"}
+  text = innerText (what WebElement.text returns), href = the anchor's
+  resolved href (what get_attribute("href") returns), link_* of the FIRST
+  anchor of the cell / row (None if there is none)
+- a TableSpec maps rows to records declaratively:
+      Column(cell index / header text or None = whole row, kind, fallback kind)
+      kind: "text" | "link_text" | "href"
+      skip_rows / min_cells / section rows (a row class that starts a new
+      group, e.g. a category heading) / required columns
+- records(rows, spec, headers) / to_frame(rows, spec, headers) → list of
+  dicts / DataFrame (headers: column titles, needed for header-text columns)
+
+Usage:
+    SPEC = TableSpec(
+        columns={
+            "Name": Column(1),
+            "Website": Column(2, "href", fallback="text"),
+        },
+        min_cells=3,
+    )
+    rows = read_tables(driver, "table")[0]
+    df = to_frame(rows, SPEC)
+"""
+
+import pandas as pd
+
+READ_TABLES_JS = """
+const selector = arguments[0], rowSelector = arguments[1];
+
+const anchor = (el) => {
+    const a = el.querySelector("a");
+    return a ? [a.innerText || "", a.href || ""] : [null, null];
+};
+
+return Array.from(document.querySelectorAll(selector)).map((table) =>
+    Array.from(table.querySelectorAll(rowSelector)).map((tr) => {
+        const [rowLinkText, rowHref] = anchor(tr);
+        return {
+            cls: (typeof tr.className === "string" ? tr.className : "") || "",
+            text: tr.innerText || "",
+            link_text: rowLinkText,
+            href: rowHref,
+            cells: Array.from(tr.querySelectorAll(":scope > td")).map((td) => {
+                const [linkText, href] = anchor(td);
+                return { text: td.innerText || "", link_text: linkText, href: href };
+            }),
+        };
+    })
+);
+"""
+
+KINDS = ("text", "link_text", "href")
+
+
+class Column:
+    """
+    One output column.
+    cell      : index of the <td>, its header text (case / whitespace
+                insensitive, needs headers) or None → the whole row
+    kind      : "text" | "link_text" | "href"
+    fallback  : kind used when `kind` gives nothing (e.g. no anchor)
+    join_lines: newlines → spaces (multi-line cells)
+    """
+
+    def __init__(self, cell: int | str | None = None, kind: str = "text", *, fallback: str | None = None, join_lines: bool = False):
+        if kind not in KINDS or (fallback is not None and fallback not in KINDS):
+            raise ValueError(f"kind / fallback must be one of {KINDS}")
+        self.cell = cell
+        self.kind = kind
+        self.fallback = fallback
+        self.join_lines = join_lines
+
+    def index(self, headers: list | None) -> int | None:
+        if not isinstance(self.cell, str):
+            return self.cell
+        wanted = _norm_header(self.cell)
+        for i, h in enumerate(headers or []):
+            if _norm_header(h) == wanted:
+                return i
+        raise KeyError(f"no column titled {self.cell!r} in {headers}")
+
+    def value(self, row: dict, index: int | None) -> str:
+        if index is None:
+            source = row
+        elif index < len(row["cells"]):
+            source = row["cells"][index]
+        else:
+            return ""
+
+        value = source.get(self.kind)
+        if not value and self.fallback is not None:
+            value = source.get(self.fallback)
+
+        value = value or ""
+        if self.join_lines:
+            value = value.replace("\n", " ")
+        return value.strip()
+
+
+class TableSpec:
+    """
+    columns        : {output column: Column}
+    skip_rows      : leading rows to drop (headings)
+    min_cells      : rows with fewer <td> are dropped
+    section_class  : a row with this class starts a new section; its text
+                     goes into `section_column` of the rows that follow
+    required       : output columns that must be non-empty
+    """
+
+    def __init__(
+        self,
+        columns: dict,
+        *,
+        skip_rows: int = 0,
+        min_cells: int = 0,
+        section_class: str | None = None,
+        section_column: str | None = None,
+        required=(),
+    ):
+        self.columns = columns
+        self.skip_rows = skip_rows
+        self.min_cells = min_cells
+        self.section_class = section_class
+        self.section_column = section_column
+        self.required = tuple(required)
+
+
+def _norm_header(text) -> str:
+    return " ".join(str(text or "").split()).lower()
+
+
+def read_tables(driver, selector: str = "table", row_selector: str = "tr") -> list:
+    """Every table matching `selector` → its rows (one WebDriver call)."""
+    return driver.execute_script(READ_TABLES_JS, selector, row_selector) or []
+
+
+def records(rows: list, spec: TableSpec, headers: list | None = None) -> list:
+    columns = [(name, column, column.index(headers)) for name, column in spec.columns.items()]
+    out = []
+    section = None
+
+    for row in rows[spec.skip_rows:]:
+        if spec.section_class and spec.section_class in row["cls"].split():
+            section = row["text"].strip()
+            continue
+
+        if len(row["cells"]) < spec.min_cells:
+            continue
+
+        rec = {}
+        if spec.section_column:
+            rec[spec.section_column] = section
+        for name, column, index in columns:
+            rec[name] = column.value(row, index)
+
+        if any(not rec[name] for name in spec.required):
+            continue
+        out.append(rec)
+
+    return out
+
+
+def to_frame(rows: list, spec: TableSpec, headers: list | None = None) -> pd.DataFrame:
+    columns = ([spec.section_column] if spec.section_column else []) + list(spec.columns)
+    return pd.DataFrame(records(rows, spec, headers), columns=columns)
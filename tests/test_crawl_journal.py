@@ -0,0 +1,66 @@
+from utils.crawl_journal import CrawlJournal
+
+
+def _page(journal, norm, depth, entries=(), enqueued=()):
+    journal.record_page(norm, norm, depth, [list(e) for e in entries], [list(e) for e in enqueued])
+
+
+def test_replay_rebuilds_bfs_state(tmp_path):
+    journal = CrawlJournal(tmp_path / "college.jsonl")
+    journal.record_start("College", "https://c.ac.in")
+    _page(
+        journal, "c.ac.in", 0,
+        entries=[("naac", "pdf", {"url": "https://c.ac.in/naac.pdf"}, "c.ac.in/naac.pdf")],
+        enqueued=[
+            ("https://c.ac.in/a", 1, "naac", "c.ac.in/a", "c.ac.in/a"),
+            ("https://c.ac.in/b", 1, "nirf", "c.ac.in/b", "c.ac.in/b"),
+        ],
+    )
+    _page(journal, "c.ac.in/a", 1, enqueued=[("https://c.ac.in/b", 2, "nirf", "c.ac.in/b", "c.ac.in/b")])
+
+    state = journal.load()
+    assert state.started and not state.done
+    assert state.pages == 2
+    assert state.max_depth == 1
+    assert state.entries == [[0, "naac", "pdf", {"url": "https://c.ac.in/naac.pdf"}, "c.ac.in/naac.pdf"]]
+    assert state.excel_canon == {"c.ac.in/naac.pdf"}
+    # merged pages are not revisited, duplicates keep their first (BFS) position
+    assert state.frontier() == [("https://c.ac.in/b", 1, "nirf")]
+
+    journal.record_done()
+    assert journal.load().done
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    journal = CrawlJournal(tmp_path / "college.jsonl")
+    journal.record_start("College", "https://c.ac.in")
+    _page(journal, "c.ac.in", 0)
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"event": "page", "norm": "c.ac.in/x", "dep')     # crash mid-write
+
+    state = journal.load()
+    assert state.visited == {"c.ac.in"}
+
+
+def test_events_after_a_torn_line_survive(tmp_path):
+    journal = CrawlJournal(tmp_path / "college.jsonl")
+    journal.record_start("College", "https://c.ac.in")
+    _page(journal, "c.ac.in", 0)
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"event": "page", "norm": "c.ac.in/x", "dep')
+
+    # resumed crawl keeps appending to the same journal
+    _page(journal, "c.ac.in/a", 1)
+    journal.record_done()
+
+    state = journal.load()
+    assert state.visited == {"c.ac.in", "c.ac.in/a"}
+    assert state.done
+
+
+def test_reset_forgets_the_previous_crawl(tmp_path):
+    journal = CrawlJournal(tmp_path / "college.jsonl")
+    journal.record_start("College", "https://c.ac.in")
+    journal.reset()
+    journal.reset()          # no file → no error
+    assert not journal.load().started
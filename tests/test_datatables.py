@@ -0,0 +1,40 @@
+import types
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from scrapers.datatables import DataTablesError, harvest_datatable, header_spec  # noqa: E402
+
+
+class Driver:
+    def __init__(self, result):
+        self.result = result
+        self.timeouts = types.SimpleNamespace(script=30)
+        self.set_to = []
+
+    def set_script_timeout(self, sec):
+        self.set_to.append(sec)
+        self.timeouts.script = sec
+
+    def execute_async_script(self, script, *args):
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_header_spec_keys_are_unique():
+    spec = header_spec(["Sr", "Name", "", "Name", ""])
+    assert list(spec.columns) == ["Sr", "Name", "column_2", "Name_3", "column_4"]
+    assert [c.cell for c in spec.columns.values()] == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("result", [{"headers": [], "rows": []}, {"error": "boom"}, TimeoutError("slow")])
+def test_harvest_restores_the_script_timeout(result):
+    driver = Driver(result)
+    if isinstance(result, dict) and not result.get("error"):
+        assert harvest_datatable(driver, "#t", timeout=300) == result
+    else:
+        with pytest.raises((DataTablesError, TimeoutError)):
+            harvest_datatable(driver, "#t", timeout=300)
+    assert driver.set_to == [300, 30]
@@ -0,0 +1,138 @@
+import json
+
+import pytest
+
+import utils.domain_health as dh
+from utils.domain_health import (
+    BREAKER_COOLDOWN_SEC,
+    BREAKER_FAILURES,
+    DomainHealth,
+    DomainOpen,
+    domain_key,
+    is_network_error,
+    parse_retry_after,
+)
+
+URL = "https://www.college.ac.in/docs/a.pdf"
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(dh.time, "time", c)
+    return c
+
+
+def _trip(health):
+    for _ in range(BREAKER_FAILURES):
+        health.delay(URL)
+        health.failure(URL)
+
+
+def test_domain_key():
+    assert domain_key("https://WWW.College.ac.in:8443/x") == "college.ac.in"
+    assert domain_key("college.ac.in/path") == "college.ac.in"
+    assert domain_key("") == ""
+
+
+def test_parse_retry_after(clock):
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    # HTTP date in the past → no wait
+    assert parse_retry_after("Thu, 01 Jan 1970 00:00:00 GMT") == 0
+    assert parse_retry_after("Mon, 12 Jan 1970 13:48:40 GMT") == pytest.approx(120)   # clock.now + 2 min
+
+
+def test_is_network_error():
+    assert is_network_error("net::ERR_NAME_NOT_RESOLVED at https://x")
+    assert is_network_error(TimeoutError("timed out"))
+    assert not is_network_error("HTTP 404")
+
+
+def test_rate_slots_follow_aimd(clock):
+    health = DomainHealth()
+    assert health.delay(URL) == 0
+    assert health.delay(URL) == pytest.approx(1 / dh.START_RATE)
+
+    health.failure(URL)                  # rate halves
+    clock.now += 10
+    health.delay(URL)
+    assert health.delay(URL) == pytest.approx(1 / (dh.START_RATE * dh.RATE_DECREASE))
+
+    health.success(URL)                  # + RATE_STEP
+    clock.now += 10
+    health.delay(URL)
+    rate = dh.START_RATE * dh.RATE_DECREASE + dh.RATE_STEP
+    assert health.delay(URL) == pytest.approx(1 / rate)
+
+
+def test_circuit_open_half_open_closed(clock):
+    health = DomainHealth()
+    _trip(health)
+    assert health.is_open(URL)
+    with pytest.raises(DomainOpen):
+        health.delay(URL)
+
+    # cooldown over → exactly one probe goes through (half-open)
+    clock.now += BREAKER_COOLDOWN_SEC + 1
+    health.delay(URL)
+    with pytest.raises(DomainOpen):
+        health.delay(URL)
+
+    health.success(URL)                  # probe answered → closed
+    assert not health.is_open(URL)
+    clock.now += 60
+    health.delay(URL)
+
+
+def test_failed_probe_reopens_with_a_longer_cooldown(clock):
+    health = DomainHealth()
+    _trip(health)
+    clock.now += BREAKER_COOLDOWN_SEC + 1
+    health.delay(URL)
+    health.failure(URL)                  # probe failed → open again, cooldown doubled
+
+    clock.now += BREAKER_COOLDOWN_SEC + 1
+    assert health.is_open(URL)
+    clock.now += BREAKER_COOLDOWN_SEC
+    assert not health.is_open(URL)
+    assert health.stats["trips"] == 2
+
+
+def test_throttle_blocks_until_retry_after_without_tripping(clock):
+    health = DomainHealth()
+    for _ in range(BREAKER_FAILURES + 1):
+        health.throttled(URL, 30)
+    assert not health.is_open(URL)
+    assert health.delay(URL) == pytest.approx(30)
+    assert health.summary()["throttled"] == 1
+
+
+def test_state_is_shared_through_the_file(tmp_path, clock):
+    path = tmp_path / "health.json"
+    crawler = DomainHealth(path)
+    _trip(crawler)
+    crawler.sync()
+
+    downloader = DomainHealth(path)
+    assert downloader.is_open(URL)
+    with pytest.raises(DomainOpen):
+        downloader.delay(URL)
+
+    # newest entry per domain wins on merge
+    clock.now += BREAKER_COOLDOWN_SEC + 1
+    downloader.delay(URL)
+    downloader.success(URL)
+    downloader.sync()
+    crawler.sync()
+    assert not crawler.is_open(URL)
+    assert json.loads(path.read_text())["college.ac.in"]["state"] == "closed"
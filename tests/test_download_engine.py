@@ -0,0 +1,177 @@
+import http.server
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from utils.domain_health import DomainHealth
+from utils.download_engine import DownloadEngine
+from utils.download_store import DownloadStore, sha256_of_file
+
+BODY = b"%PDF-1.4 " + b"x" * 200_000
+ETAG = '"v1"'
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    hits = {}
+    ranges = []
+
+    def do_GET(self):
+        type(self).hits[self.path] = type(self).hits.get(self.path, 0) + 1
+        type(self).ranges.append(self.headers.get("Range"))
+        if self.path == "/missing.pdf":
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.path == "/loop.pdf":
+            self.send_response(302)
+            self.send_header("Location", "/loop.pdf")
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        rng = self.headers.get("Range")
+        if rng and self.headers.get("If-Range") == ETAG:
+            start = int(rng.split("=")[1].rstrip("-"))
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(BODY) - 1}/{len(BODY)}")
+            self.send_header("Content-Length", str(len(BODY) - start))
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            self.wfile.write(BODY[start:])
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        # slow body → concurrent fetches of one url would overlap
+        for i in range(0, len(BODY), 20_000):
+            self.wfile.write(BODY[i:i + 20_000])
+            self.wfile.flush()
+            time.sleep(0.01)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.hits = {}
+    _Handler.ranges = []
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_same_url_to_many_targets_is_fetched_once(server, tmp_path):
+    store = DownloadStore(str(tmp_path / "store"))
+    url = server + "/doc.pdf"
+    targets = [str(tmp_path / "out" / f"college{i}" / "doc.pdf") for i in range(4)]
+
+    with DownloadEngine(max_workers=4, per_domain=4, store=store) as engine:
+        futures = [engine.submit(url, t) for t in targets]
+        results = [f.result() for f in futures]
+
+    assert all(r["ok"] for r in results), [r["error"] for r in results]
+    assert sorted(r["status"] for r in results) == ["cached"] * 3 + ["downloaded"]
+    assert _Handler.hits["/doc.pdf"] == 1
+
+    want = sha256_of_file(results[0]["path"])
+    for r in results:
+        assert os.path.getsize(r["path"]) == len(BODY)
+        assert sha256_of_file(r["path"]) == want
+    assert os.listdir(store.tmp_dir) == []
+
+
+def test_next_run_revalidates_with_a_conditional_request(server, tmp_path):
+    root = str(tmp_path / "store")
+    url = server + "/doc.pdf"
+    target = str(tmp_path / "out" / "doc.pdf")
+
+    with DownloadEngine(max_workers=1, store=DownloadStore(root)) as engine:
+        assert engine.download(url, target)["status"] == "downloaded"
+        # same run → no request at all
+        assert engine.download(url, target)["status"] == "cached"
+    assert _Handler.hits["/doc.pdf"] == 1
+
+    with DownloadEngine(max_workers=1, store=DownloadStore(root)) as engine:
+        result = engine.download(url, target)
+    assert result["status"] == "unchanged"
+    assert result["path"] == target
+    assert _Handler.hits["/doc.pdf"] == 2
+
+
+def test_same_target_is_queued_once(server, tmp_path):
+    with DownloadEngine(max_workers=2) as engine:
+        first = engine.submit(server + "/a.pdf", str(tmp_path / "a.pdf"))
+        second = engine.submit(server + "/a.pdf", str(tmp_path / "a.pdf"))
+        assert second is None
+        assert first.result()["status"] == "downloaded"
+
+
+def test_http_404_is_not_retried(server, tmp_path):
+    with DownloadEngine(max_workers=1, retries=3, backoff_sec=0) as engine:
+        result = engine.download(server + "/missing.pdf", str(tmp_path / "m.pdf"))
+
+    assert not result["ok"]
+    assert result["attempts"] == 1
+    assert result["error"] == "HTTP 404"
+
+
+def test_other_request_errors_are_retried_and_reported(server, tmp_path):
+    health = DomainHealth()
+    with DownloadEngine(max_workers=1, retries=2, backoff_sec=0, health=health) as engine:
+        result = engine.download(server + "/loop.pdf", str(tmp_path / "loop.pdf"))
+
+    assert not result["ok"]
+    assert result["attempts"] == 3
+    assert result["error"].startswith("TooManyRedirects")
+    # the server answered every time → no breaker trip
+    assert not health.is_open(server)
+
+
+def test_invalid_url_is_retried_without_touching_health(tmp_path):
+    health = DomainHealth()
+    with DownloadEngine(max_workers=1, retries=1, backoff_sec=0, health=health) as engine:
+        result = engine.download("http://", str(tmp_path / "x.pdf"))
+
+    assert not result["ok"]
+    assert result["attempts"] == 2
+    assert result["error"].startswith("InvalidURL")
+    assert health.stats["trips"] == 0
+
+
+def _leftover_part(target, etag):
+    with open(target + ".part", "wb") as f:
+        f.write(BODY[:1000])
+    if etag:
+        with open(target + ".part.meta", "w", encoding="utf-8") as f:
+            json.dump({"etag": etag, "last_modified": None}, f)
+
+
+@pytest.mark.parametrize(
+    "etag, sent_range",
+    [
+        (ETAG, "bytes=1000-"),      # same version → resumed
+        ('"v0"', "bytes=1000-"),    # changed → server sends the whole file
+        (None, None),               # no validator → .part dropped, fresh GET
+    ],
+)
+def test_part_from_an_earlier_run_is_resumed_only_if_unchanged(server, tmp_path, etag, sent_range):
+    target = str(tmp_path / "doc.pdf")
+    _leftover_part(target, etag)
+
+    with DownloadEngine(max_workers=1) as engine:
+        result = engine.download(server + "/doc.pdf", target)
+
+    assert result["status"] == "downloaded", result["error"]
+    assert _Handler.ranges == [sent_range]
+    assert open(target, "rb").read() == BODY
+    assert not os.path.exists(target + ".part.meta")
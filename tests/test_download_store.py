@@ -0,0 +1,100 @@
+import os
+import time
+
+import pytest
+
+from utils.download_store import DownloadStore, sha256_of_file
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DownloadStore(str(tmp_path / "store"), link_mode="copy")
+
+
+def _ingest(store, url, data, etag=None, last_modified=None):
+    return store.ingest_bytes(url, data, etag, last_modified)
+
+
+def test_same_content_is_stored_once(store):
+    a = _ingest(store, "https://a.ac.in/x.pdf", b"same")
+    b = _ingest(store, "https://b.ac.in/y.pdf", b"same")
+    assert a == b
+    blobs = [f for _, _, files in os.walk(store.blob_dir) for f in files]
+    assert blobs == [a + ".pdf"]
+    assert os.listdir(store.tmp_dir) == []
+
+
+def test_lookup_needs_the_blob(store):
+    sha = _ingest(store, "https://a.ac.in/x.pdf", b"data", etag='"e1"')
+    assert store.lookup("https://a.ac.in/x.pdf")["etag"] == '"e1"'
+
+    os.remove(store.blob_path(sha))
+    assert store.lookup("https://a.ac.in/x.pdf") is None
+    assert store.lookup("https://a.ac.in/unknown.pdf") is None
+
+
+def test_is_fresh_within_run_or_max_age(tmp_path):
+    store = DownloadStore(str(tmp_path / "store"))
+    assert not store.is_fresh(None)
+    assert store.is_fresh({"fetched_at": time.time()})
+    assert not store.is_fresh({"fetched_at": store.session_start - 10})
+
+    aged = DownloadStore(str(tmp_path / "store"), max_age_sec=3600)
+    assert aged.is_fresh({"fetched_at": aged.session_start - 10})
+    assert not aged.is_fresh({"fetched_at": time.time() - 7200})
+
+
+def test_touch_makes_a_record_fresh_again(store):
+    url = "https://a.ac.in/x.pdf"
+    _ingest(store, url, b"data")
+    with store._connect() as conn:
+        conn.execute("UPDATE urls SET fetched_at = 0 WHERE url = ?", (url,))
+    assert not store.is_fresh(store.lookup(url))
+
+    store.touch(url)      # 304 Not Modified
+    assert store.is_fresh(store.lookup(url))
+
+
+def test_conditional_headers(store):
+    assert store.conditional_headers(None) == {}
+    assert store.conditional_headers({"etag": '"e1"', "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT"}) == {
+        "If-None-Match": '"e1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert store.conditional_headers({"etag": None, "last_modified": None}) == {}
+
+
+def test_link_never_overwrites_another_file(store, tmp_path):
+    target = str(tmp_path / "out" / "doc.pdf")
+    a = _ingest(store, "https://a.ac.in/doc.pdf", b"first")
+    b = _ingest(store, "https://b.ac.in/doc.pdf", b"second")
+
+    assert store.link(a, target, "https://a.ac.in/doc.pdf") == target
+    # same content again → same path
+    assert store.link(a, target, "https://a.ac.in/doc.pdf") == target
+
+    other = store.link(b, target, "https://b.ac.in/doc.pdf")
+    assert other == str(tmp_path / "out" / f"doc_{b[:8]}.pdf")
+    assert open(target, "rb").read() == b"first"
+    assert open(other, "rb").read() == b"second"
+
+
+def test_link_refreshes_the_same_url_in_place(store, tmp_path):
+    target = str(tmp_path / "out" / "doc.pdf")
+    url = "https://a.ac.in/doc.pdf"
+
+    store.link(_ingest(store, url, b"old"), target, url)
+    new = _ingest(store, url, b"new")
+    assert store.link(new, target, url) == target
+    assert sha256_of_file(target) == new
+
+
+def test_part_path_is_per_url(store):
+    assert store.part_path("https://a.ac.in/x.pdf") == store.part_path("https://a.ac.in/x.pdf")
+    assert store.part_path("https://a.ac.in/x.pdf") != store.part_path("https://a.ac.in/y.pdf")
+    assert os.path.dirname(store.part_path("https://a.ac.in/x.pdf")) == store.tmp_dir
+
+
+def test_unknown_link_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        DownloadStore(str(tmp_path / "store"), link_mode="move")
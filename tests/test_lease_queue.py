@@ -0,0 +1,99 @@
+import pytest
+
+import utils.lease_queue as lq
+from utils.lease_queue import DONE, FAILED, LEASED, PENDING, LeaseQueue
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(lq.time, "time", c)
+    return c
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    q = LeaseQueue(tmp_path / "queue.sqlite", lease_sec=60, max_attempts=2)
+    q.seed([("a", {"n": 1}), ("b", {"n": 2})])
+    return q
+
+
+def test_seed_is_idempotent_and_keeps_order(queue):
+    assert queue.seed([("b", {"n": 9}), ("c", {"n": 3})]) == 1
+
+    keys = []
+    while (job := queue.claim("w")) is not None:
+        keys.append(job["job_key"])
+        assert queue.complete(job["job_key"], "w")
+    assert keys == ["a", "b", "c"]
+    assert queue.counts()[DONE] == 3
+
+
+def test_claim_leases_one_job_per_worker(queue):
+    a = queue.claim("w1")
+    b = queue.claim("w2")
+    assert (a["job_key"], b["job_key"]) == ("a", "b")
+    assert a["payload"] == {"n": 1}
+    assert a["attempts"] == 1
+    assert queue.claim("w3") is None
+    assert queue.counts()[LEASED] == 2
+
+
+def test_expired_lease_is_handed_to_the_next_worker(queue, clock):
+    job = queue.claim("w1")
+    clock.now += 30
+    assert queue.heartbeat(job["job_key"], "w1")      # lease now ends at +90
+
+    clock.now += 50
+    assert queue.claim("w2")["job_key"] == "b"         # "a" still leased
+
+    clock.now += 30
+    again = queue.claim("w2")
+    assert again["job_key"] == "a"
+    assert again["attempts"] == 2
+
+    # the crashed worker lost its lease
+    assert not queue.heartbeat("a", "w1")
+    assert not queue.complete("a", "w1")
+    assert queue.complete("a", "w2")
+
+
+def test_lease_expired_after_last_attempt_marks_failed(queue, clock):
+    queue.claim("w1")
+    clock.now += 61
+    assert queue.claim("w2")["attempts"] == 2          # "a" again, last attempt
+    clock.now += 61
+
+    # "a" expired on its last attempt → failed, "b" is handed out
+    job = queue.claim("w3")
+    assert job["job_key"] == "b"
+    with queue._connect() as conn:
+        row = conn.execute("SELECT status, last_error FROM jobs WHERE job_key = 'a'").fetchone()
+    assert row["status"] == FAILED
+    assert row["last_error"] == "lease expired"
+
+
+def test_fail_retries_until_max_attempts(queue):
+    job = queue.claim("w")
+    assert queue.fail(job["job_key"], "w", "boom")
+    assert queue.counts()[PENDING] == 2
+
+    job = queue.claim("w")
+    assert job["job_key"] == "a" and job["attempts"] == 2
+    assert queue.fail(job["job_key"], "w", "boom again")
+    assert queue.counts()[FAILED] == 1
+
+
+def test_fail_without_retry_is_final(queue):
+    job = queue.claim("w")
+    assert queue.fail(job["job_key"], "w", "bad url", retry=False)
+    assert queue.counts()[FAILED] == 1
+    assert queue.unfinished() == 1
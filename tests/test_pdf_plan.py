@@ -0,0 +1,186 @@
+import os
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from utils.pdf_plan import build_workbook_plan, newest_year, plan_units, split_units
+
+KEYWORDS = {"naac", "nirf", "mandatory_disclosure", "aqar"}
+OUT = os.path.join("out", "pdf_download_college")
+
+
+def filename(link):
+    return link.rsplit("/", 1)[-1]
+
+
+# ----------------- the per-row helpers the notebook used before pdf_plan -----------------
+
+def legacy_split_links_with_text(cell_value):
+    if not isinstance(cell_value, str):
+        return []
+    text = cell_value.replace("\r", " ").replace("\n", " ").strip()
+    parts = re.split(r"(https://|http://)", text)
+    chunks = []
+    i = 1
+    while i < len(parts) - 1:
+        chunks.append((parts[i] + parts[i + 1]).strip())
+        i += 2
+    return chunks
+
+
+def legacy_extract_pdf_link_from_unit(unit):
+    match = re.search(r"(https?://(?:[^\s]|[\s\-]){1,1000}?\.pdf)", unit.replace("\r", ""), re.IGNORECASE)
+    return match.group(1) if match else None
+
+
+def legacy_normalize_text_for_match(text):
+    text = re.sub(r"[^a-z0-9]", "_", text.lower())
+    return re.sub(r"_+", "_", text).strip("_")
+
+
+def legacy_extract_document_years(text):
+    text = unicodedata.normalize("NFKD", text)
+    text = re.sub(r"[._/\\\-–—]+", " ", text).replace("%20", " ")
+    text = re.sub(r"\s+", " ", text).strip()
+    years = {int(y) for y in re.findall(r"(?<!\d)(19\d{2}|20\d{2})(?!\d)", text)}
+    for y1, y2 in re.findall(r"(?<!\d)(19\d{2}|20\d{2})\s*[-/–—_]\s*(\d{2}|19\d{2}|20\d{2})(?!\d)", text):
+        years.add(int(y1))
+        years.add(int(y1[:2] + y2) if len(y2) == 2 else int(y2))
+    return sorted(years)
+
+
+def legacy_unit_has_old_year(text):
+    years = legacy_extract_document_years(text)
+    return bool(years) and max(years) < 2019
+
+
+def legacy_nirf_with_innovation_or_management(unit):
+    text = legacy_normalize_text_for_match(unit)
+    management = ("management", "mgmt", "mgmnt", "mgt", "mba", "pgdm", "business_administration")
+    return (
+        any(t in text for t in ("nirf", "national_institutional_ranking_framework"))
+        and any(t in text for t in ("innovation", "innv") + management)
+    )
+
+
+def legacy_plan(df, output_dir, keywords):
+    """The old iterrows() × columns walk, without the downloading."""
+    seen = set()
+    plan = []
+    for _, row in df.iterrows():
+        if str(row.get("row_type", "")).strip().lower() != "pdf":
+            continue
+        depth = int(row.get("depth", -1))
+        for col in df.columns:
+            if col in {"row_type", "depth"}:
+                continue
+            for unit in legacy_split_links_with_text(row[col]):
+                if depth == 0 and not any(kw in legacy_normalize_text_for_match(unit) for kw in keywords):
+                    continue
+                if legacy_nirf_with_innovation_or_management(unit):
+                    continue
+                link = legacy_extract_pdf_link_from_unit(unit)
+                if not link:
+                    continue
+                if legacy_unit_has_old_year(unit) or legacy_unit_has_old_year(link):
+                    continue
+                if link in seen:
+                    continue
+                seen.add(link)
+                years = legacy_extract_document_years(unit)
+                folder = str(max(years)) if years else "no_year"
+                plan.append((link, os.path.join(output_dir, folder, filename(link))))
+    return plan
+
+
+# ----------------- fixtures -----------------
+
+def workbook():
+    return pd.DataFrame({
+        "row_type": ["pdf", "pdf", "html", "pdf", "PDF ", "pdf"],
+        "depth": [0, 1, 0, 2, 1, 0],
+        "naac_links": [
+            "https://c.ac.in/naac/ssr_2022.pdf || NAAC SSR https://c.ac.in/misc/notes.pdf || notes",
+            "https://c.ac.in/aqar/AQAR%202017-18.pdf || AQAR 2017-18\nhttps://c.ac.in/aqar/aqar_2019-20.pdf || AQAR",
+            "https://c.ac.in/naac/page.pdf || NAAC",
+            np.nan,
+            "https://c.ac.in/naac/ssr_2022.pdf || NAAC SSR again",
+            "https://c.ac.in/home || NAAC home page",
+        ],
+        "nirf_links": [
+            "https://c.ac.in/nirf/NIRF_MBA_2023.pdf || NIRF management",
+            "https://c.ac.in/nirf/nirf_2024.pdf || NIRF 2024 https://c.ac.in/nirf/old/2015/data.pdf || NIRF",
+            "",
+            "http://c.ac.in/nirf/Innovation_2022.pdf || NIRF innovation",
+            "https://c.ac.in/files/Data –  2018–2019 .PDF || NIRF data",
+            "https://c.ac.in/docs/mandatory-disclosure.pdf || Mandatory Disclosure",
+        ],
+    })
+
+
+# ----------------- tests -----------------
+
+def test_workbook_plan_matches_the_old_per_row_helpers():
+    df = workbook()
+    plan, skipped = build_workbook_plan(df, OUT, KEYWORDS, filename)
+
+    assert list(zip(plan["link"], plan["file_path"])) == legacy_plan(df, OUT, KEYWORDS)
+    assert len(plan) > 0
+    assert skipped["nirf"] == 2
+    assert skipped["no_keyword"] == 1        # notes.pdf at depth 0
+    assert skipped["old_year"] == 2          # AQAR 2017-18, /old/2015/
+    assert skipped["duplicate"] == 1         # ssr_2022.pdf again
+
+
+def test_year_folder_and_filters():
+    df = workbook()
+    plan, _ = build_workbook_plan(df, OUT, KEYWORDS, filename)
+    paths = dict(zip(plan["link"], plan["file_path"]))
+
+    assert paths["https://c.ac.in/naac/ssr_2022.pdf"] == os.path.join(OUT, "2022", "ssr_2022.pdf")
+    # separators become spaces before the range pattern runs (as before) → "2019-20" is 2019
+    assert paths["https://c.ac.in/aqar/aqar_2019-20.pdf"] == os.path.join(OUT, "2019", "aqar_2019-20.pdf")
+    assert paths["https://c.ac.in/docs/mandatory-disclosure.pdf"] == os.path.join(OUT, "no_year", "mandatory-disclosure.pdf")
+    # html rows never planned, NIRF + management / innovation dropped
+    assert "https://c.ac.in/naac/page.pdf" not in paths
+    assert not any("MBA" in link or "Innovation" in link for link in paths)
+
+
+def test_split_units_keeps_cell_order_and_index():
+    cells = pd.Series(["x https://a/1.pdf one http://a/2.pdf two", np.nan, "https://a/3.pdf"])
+    units = split_units(cells)
+    assert units.tolist() == ["https://a/1.pdf one", "http://a/2.pdf two", "https://a/3.pdf"]
+    assert units.index.tolist() == [0, 0, 2]
+    assert units.tolist() == sum((legacy_split_links_with_text(c) for c in cells), [])
+
+
+def test_newest_year_matches_the_old_year_detection():
+    texts = pd.Series([
+        "AQAR 2017-18", "report_2019_20.pdf", "2021/2022", "no year here",
+        "phone 120194 code", "NIRF%202023", "Data – 2018–2019", "1999",
+    ])
+    got = newest_year(texts).tolist()
+    for text, year in zip(texts, got):
+        years = legacy_extract_document_years(text)
+        assert (np.isnan(year) and not years) or year == max(years), text
+
+
+def test_plan_units_streaming_dedupe_across_batches():
+    seen = set()
+    units = pd.Series(["https://c.ac.in/a_2023.pdf || NAAC", "https://c.ac.in/b.pdf || NAAC"])
+
+    first, _ = plan_units(units, [1, 1], OUT, KEYWORDS, filename, seen=seen)
+    again, skipped = plan_units(units, [1, 1], OUT, KEYWORDS, filename, seen=seen)
+
+    assert len(first) == 2
+    assert again.empty
+    assert skipped["duplicate"] == 2
+    assert seen == {"https://c.ac.in/a_2023.pdf", "https://c.ac.in/b.pdf"}
+
+
+def test_workbook_without_row_type_gives_an_empty_plan():
+    plan, skipped = build_workbook_plan(pd.DataFrame({"naac_links": ["https://a/x.pdf"]}), OUT, KEYWORDS, filename)
+    assert plan.empty
+    assert sum(skipped.values()) == 0
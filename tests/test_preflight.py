@@ -0,0 +1,116 @@
+import http.server
+import threading
+import time
+
+import pytest
+
+from utils.preflight import (
+    DNS_FAILED,
+    HTTP_ERROR,
+    INVALID,
+    OK,
+    UNREACHABLE,
+    PreflightCache,
+    Prober,
+    is_alive,
+    normalize_url,
+    run_preflight,
+)
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/old":
+            self.send_response(301)
+            self.send_header("Location", "/new")
+            self.end_headers()
+            return
+        self.send_response(500 if self.path == "/broken" else 200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def _closed_port_urls(n):
+    # ports 1..n on localhost: nothing listens there → connection refused
+    return [f"http://127.0.0.1:{port}/" for port in range(1, n + 1)]
+
+
+def test_normalize_url_and_is_alive():
+    assert normalize_url(" www.c.ac.in/ ") == "https://www.c.ac.in/"
+    assert normalize_url("http://c.ac.in") == "http://c.ac.in"
+    assert normalize_url("") == ""
+    assert is_alive(None)
+    assert is_alive({"status": HTTP_ERROR})
+    assert not is_alive({"status": DNS_FAILED})
+
+
+def test_probe_statuses(server):
+    prober = Prober(workers=2, timeout=(2, 5))
+    try:
+        ok = prober.probe(server + "/old")
+        assert ok["status"] == OK
+        assert ok["final_url"] == server + "/new"
+
+        assert prober.probe(server + "/broken")["status"] == HTTP_ERROR
+        assert prober.probe("https://")["status"] == INVALID
+        assert prober.probe("http://no-such-host.invalid/")["status"] == DNS_FAILED
+        assert prober.probe(_closed_port_urls(1)[0])["status"] == UNREACHABLE
+    finally:
+        prober.close()
+
+
+def test_cache_ttl_and_persistence(tmp_path):
+    path = tmp_path / "preflight.json"
+    cache = PreflightCache(path, alive_ttl_sec=100, dead_ttl_sec=10)
+    now = time.time()
+    cache.put({"url": "a", "status": OK, "checked_at": now - 50})
+    cache.put({"url": "b", "status": DNS_FAILED, "checked_at": now - 50})
+    cache.save()
+
+    again = PreflightCache(path, alive_ttl_sec=100, dead_ttl_sec=10)
+    assert again.get("a")["status"] == OK
+    assert again.get("b") is None            # dead results expire sooner
+    assert again.get("c") is None
+
+
+def test_run_preflight_uses_the_cache(server, tmp_path):
+    cache = PreflightCache(tmp_path / "preflight.json")
+    urls = [server + "/", server + "/broken", server + "/"]
+    calls = []
+
+    first = run_preflight(urls, cache, workers=2, on_result=lambda r, cached: calls.append(cached))
+    assert set(first) == {server + "/", server + "/broken"}
+    assert calls == [False, False]
+
+    calls.clear()
+    second = run_preflight(urls, PreflightCache(tmp_path / "preflight.json"), workers=2,
+                           on_result=lambda r, cached: calls.append(cached))
+    assert second == first
+    assert calls == [True, True]
+
+
+def test_local_outage_is_neither_cached_nor_returned(tmp_path):
+    cache = PreflightCache(tmp_path / "preflight.json")
+    results = run_preflight(_closed_port_urls(5), cache, workers=5)
+    assert results == {}
+    assert not (tmp_path / "preflight.json").exists()
+
+
+def test_dead_hosts_are_cached_when_others_are_alive(server, tmp_path):
+    cache = PreflightCache(tmp_path / "preflight.json")
+    urls = _closed_port_urls(4) + [server + "/"]
+    results = run_preflight(urls, cache, workers=5)
+    assert results[server + "/"]["status"] == OK
+    assert all(results[u]["status"] == UNREACHABLE for u in urls[:4])
+    assert cache.get(urls[0])["status"] == UNREACHABLE
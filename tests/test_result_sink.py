@@ -0,0 +1,25 @@
+from utils.result_sink import JsonlSink, open_sink
+
+
+def test_jsonl_write_read_reset(tmp_path):
+    sink = open_sink(tmp_path / "1_ABC")
+    assert sink.path.name == "1_ABC.jsonl"
+    assert sink.read() == []
+
+    assert sink.write([{"a": 1}, {"a": 2}]) == 2
+    assert sink.write([]) == 0
+    assert sink.read() == [{"a": 1}, {"a": 2}]
+
+    sink.reset()
+    assert sink.read() == []
+
+
+def test_torn_tail_keeps_later_batches(tmp_path):
+    sink = JsonlSink(tmp_path / "rows.jsonl")
+    sink.write([{"a": 1}])
+    with open(sink.path, "a", encoding="utf-8") as f:
+        f.write('{"a": 2, "b"')        # crash mid-write
+
+    # resumed run appends after the torn line, not onto it
+    sink.write([{"a": 3}])
+    assert sink.read() == [{"a": 1}, {"a": 3}]
@@ -0,0 +1,100 @@
+import pytest
+
+from scrapers.table_extract import Column, TableSpec, read_tables, records, to_frame
+
+
+def cell(text, link_text=None, href=None):
+    return {"text": text, "link_text": link_text, "href": href}
+
+
+def row(*cells, cls=""):
+    linked = next((c for c in cells if c["href"]), cell("", None, None))
+    return {
+        "cls": cls,
+        "text": "\t".join(c["text"] for c in cells),
+        "link_text": linked["link_text"],
+        "href": linked["href"],
+        "cells": list(cells),
+    }
+
+
+ROWS = [
+    row(cell("Sr"), cell("College"), cell("Website")),
+    row(cell("Engineering"), cls="group-heading"),
+    row(cell("1"), cell("ABC College\nPune", "ABC College", "https://abc.ac.in/"), cell("abc.ac.in", "abc.ac.in", "https://abc.ac.in")),
+    row(cell("2"), cell("XYZ Institute"), cell("www.xyz.edu")),
+    row(cell("Pharmacy"), cls="group-heading other"),
+    row(cell("3"), cell("PQR Pharmacy"), cell("")),
+    row(cell("note")),
+]
+
+
+def test_fallback_join_lines_and_sections():
+    spec = TableSpec(
+        columns={
+            "Name": Column(1, join_lines=True),
+            "Link name": Column(1, "link_text", fallback="text"),
+            "Website": Column(2, "href", fallback="text"),
+        },
+        skip_rows=1,
+        min_cells=3,
+        section_class="group-heading",
+        section_column="Stream",
+    )
+    assert records(ROWS, spec) == [
+        {"Stream": "Engineering", "Name": "ABC College Pune", "Link name": "ABC College", "Website": "https://abc.ac.in"},
+        {"Stream": "Engineering", "Name": "XYZ Institute", "Link name": "XYZ Institute", "Website": "www.xyz.edu"},
+        {"Stream": "Pharmacy", "Name": "PQR Pharmacy", "Link name": "PQR Pharmacy", "Website": ""},
+    ]
+
+
+def test_required_columns_drop_rows():
+    spec = TableSpec(columns={"Name": Column(1), "Website": Column(2)}, skip_rows=1, min_cells=3, required=["Website"])
+    assert [r["Name"] for r in records(ROWS, spec)] == ["ABC College\nPune", "XYZ Institute"]
+
+
+def test_whole_row_and_missing_cells():
+    spec = TableSpec(columns={"Row link": Column(None, "href"), "Fifth": Column(4)}, skip_rows=2, min_cells=3)
+    out = records(ROWS, spec)
+    assert out[0] == {"Row link": "https://abc.ac.in/", "Fifth": ""}
+    assert out[1]["Row link"] == ""
+
+
+def test_header_text_columns():
+    headers = ["Sr", " College  Name ", "Web Site"]
+    spec = TableSpec(columns={"Name": Column("college name"), "Website": Column("WEB SITE", "href", fallback="text")}, min_cells=3)
+    frame = to_frame(ROWS[2:4], spec, headers=headers)
+    assert frame.to_dict("records") == [
+        {"Name": "ABC College\nPune", "Website": "https://abc.ac.in"},
+        {"Name": "XYZ Institute", "Website": "www.xyz.edu"},
+    ]
+
+    with pytest.raises(KeyError):
+        records(ROWS, TableSpec(columns={"x": Column("Fax")}), headers=headers)
+
+
+def test_to_frame_keeps_columns_when_empty():
+    spec = TableSpec(columns={"Name": Column(1)}, section_class="group-heading", section_column="Stream", min_cells=9)
+    frame = to_frame(ROWS, spec)
+    assert frame.empty
+    assert list(frame.columns) == ["Stream", "Name"]
+
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError):
+        Column(1, "html")
+    with pytest.raises(ValueError):
+        Column(1, "text", fallback="title")
+
+
+def test_read_tables_is_one_script_call():
+    class Driver:
+        calls = []
+
+        def execute_script(self, script, *args):
+            self.calls.append(args)
+            return None
+
+    driver = Driver()
+    assert read_tables(driver, "#list", "tbody tr") == []
+    assert driver.calls == [("#list", "tbody tr")]
@@ -0,0 +1,303 @@
+"""
+adaptive_wait.py
+
+Event-driven waits for Playwright pages: a wait ends as soon as the page is
+quiet instead of always sleeping its full length. The old fixed sleeps
+(EXTRA_WAIT_MS, SCROLL_WAIT_MS, popup / redirect settles, retry backoffs)
+are kept ONLY as upper bounds.
+
+"Quiet" means both:
+- network : no document / script / xhr / fetch request of the page in flight
+            (request / requestfinished / requestfailed events)
+- DOM     : no node added / removed / text changed for `quiet_ms`
+            (MutationObserver inside the page, installed on first use or via
+            QUIET_INIT_JS as a context init script)
+
+`quiet_ms` is learned per domain: an EWMA of the request latency observed on
+that domain, clamped to [MIN_QUIET_MS, MAX_QUIET_MS].
+
+Every wait records its budget and the time really spent on page._wait_stats,
+so the crawler can report the seconds saved per page (wait_report).
+"""
+
+import asyncio
+import time
+from urllib.parse import urlparse
+
+# ================= CONFIG =================
+
+MIN_QUIET_MS = 200           # DOM / network must stay quiet at least this long
+MAX_QUIET_MS = 1000
+QUIET_LATENCY_FACTOR = 1.5   # quiet window = factor × learned request latency
+EWMA_ALPHA = 0.3
+STALE_REQUEST_SEC = 10       # long-poll / streaming requests never block a wait
+TRACKED_RESOURCE_TYPES = {"document", "script", "xhr", "fetch"}
+
+# MutationObserver → window.__crawlerQuiet.last (attribute changes are
+# ignored: sliders / tickers flip classes & styles forever)
+_INSTALL_JS = """
+    if (!window.__crawlerQuiet) {
+        window.__crawlerQuiet = { last: performance.now() };
+        try {
+            new MutationObserver(() => {
+                window.__crawlerQuiet.last = performance.now();
+            }).observe(document, { subtree: true, childList: true, characterData: true });
+        } catch (e) {}
+    }
+"""
+
+QUIET_INIT_JS = "(() => {" + _INSTALL_JS + "})();"
+
+# resolves true once the DOM was quiet for quietMs, false after maxMs
+WAIT_DOM_QUIET_JS = """
+([quietMs, maxMs]) => {
+""" + _INSTALL_JS + """
+    const q = window.__crawlerQuiet;
+    const start = performance.now();
+
+    return new Promise(resolve => {
+        const check = () => {
+            const now = performance.now();
+            const idle = now - q.last;
+            if (idle >= quietMs) return resolve(true);
+            if (now - start >= maxMs) return resolve(false);
+            setTimeout(check, Math.min(quietMs - idle, maxMs - (now - start)) + 5);
+        };
+        check();
+    });
+}
+"""
+
+
+class DomainLatency:
+    """
+    EWMA of request latency per domain (seconds).
+    """
+
+    def __init__(self, alpha: float = EWMA_ALPHA):
+        self.alpha = alpha
+        self.ewma = {}
+
+    def observe(self, domain: str, seconds: float):
+        if not domain or seconds < 0:
+            return
+        old = self.ewma.get(domain)
+        self.ewma[domain] = seconds if old is None else old + self.alpha * (seconds - old)
+
+    def quiet_ms(self, domain: str) -> int:
+        sec = self.ewma.get(domain)
+        if sec is None:
+            return MAX_QUIET_MS // 2
+        return int(min(MAX_QUIET_MS, max(MIN_QUIET_MS, sec * 1000 * QUIET_LATENCY_FACTOR)))
+
+    def backoff_ms(self, domain: str, cap_ms: int, factor: float = 4, floor_ms: int = 1000) -> int:
+        """Retry pause: a few request latencies, never more than the old fixed pause."""
+        sec = self.ewma.get(domain)
+        if sec is None:
+            return cap_ms
+        return int(min(cap_ms, max(floor_ms, sec * 1000 * factor)))
+
+
+LATENCY = DomainLatency()
+
+
+class NetworkTracker:
+    """
+    In-flight request bookkeeping for one page (fed by page events).
+    """
+
+    def __init__(self):
+        self.pending = {}            # request → start time
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+    def reset(self):
+        self.pending.clear()
+        self.idle.set()
+
+    def on_request(self, request):
+        try:
+            if request.resource_type not in TRACKED_RESOURCE_TYPES:
+                return
+        except Exception:
+            return
+        self.pending[request] = time.monotonic()
+        self.idle.clear()
+
+    def on_done(self, request):
+        start = self.pending.pop(request, None)
+        if start is None:
+            return
+
+        try:
+            LATENCY.observe(urlparse(request.url).netloc, time.monotonic() - start)
+        except Exception:
+            pass
+
+        if not self.pending:
+            self.idle.set()
+
+    def busy_for(self) -> float | None:
+        """
+        None if quiet, else seconds until the oldest non-stale request
+        turns stale (the longest we need to wait for it).
+        """
+        now = time.monotonic()
+        waits = [
+            STALE_REQUEST_SEC - (now - start)
+            for start in self.pending.values()
+            if now - start < STALE_REQUEST_SEC
+        ]
+        return max(waits) if waits else None
+
+
+def attach_network_tracker(page) -> NetworkTracker:
+    """Once per page; a pooled page that already has one gets it reset."""
+    page._wait_stats = [0.0, 0.0, 0]     # budget sec, spent sec, waits
+
+    tracker = getattr(page, "_net", None)
+    if tracker is not None:
+        tracker.reset()
+        return tracker
+
+    tracker = NetworkTracker()
+    page._net = tracker
+
+    page.on("request", tracker.on_request)
+    page.on("requestfinished", tracker.on_done)
+    page.on("requestfailed", tracker.on_done)
+    return tracker
+
+
+def _record(page, budget_ms: float, spent_sec: float):
+    stats = getattr(page, "_wait_stats", None)
+    if stats is None:
+        stats = page._wait_stats = [0.0, 0.0, 0]
+    stats[0] += budget_ms / 1000
+    stats[1] += min(spent_sec, budget_ms / 1000)
+    stats[2] += 1
+
+
+async def _network_quiet(page, deadline: float) -> bool:
+    tracker = getattr(page, "_net", None)
+    if tracker is None:
+        return True
+
+    while True:
+        busy = tracker.busy_for()
+        if busy is None:
+            return True
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+
+        try:
+            await asyncio.wait_for(tracker.idle.wait(), timeout=min(remaining, busy))
+        except asyncio.TimeoutError:
+            pass
+
+
+async def wait_quiet(page, max_ms: float, *, quiet_ms: int | None = None, record: bool = True) -> bool:
+    """
+    Wait until network AND DOM are quiet, at most max_ms.
+    Returns True if the page became quiet, False on the upper bound.
+    Never raises.
+    """
+    start = time.monotonic()
+    deadline = start + max_ms / 1000
+    quiet = False
+
+    try:
+        if page.is_closed():
+            return False
+
+        if quiet_ms is None:
+            quiet_ms = LATENCY.quiet_ms(urlparse(page.url).netloc)
+        quiet_ms = min(quiet_ms, max_ms)
+
+        while time.monotonic() < deadline:
+            if not await _network_quiet(page, deadline):
+                break
+
+            remaining_ms = (deadline - time.monotonic()) * 1000
+            if remaining_ms <= 0:
+                break
+
+            try:
+                dom_quiet = await asyncio.wait_for(
+                    page.evaluate(WAIT_DOM_QUIET_JS, [quiet_ms, remaining_ms]),
+                    timeout=remaining_ms / 1000 + 1,
+                )
+            except asyncio.TimeoutError:
+                break
+            except Exception:
+                # navigation in progress (context destroyed) → not quiet yet
+                if page.is_closed():
+                    break
+                await asyncio.sleep(min(quiet_ms / 1000, max(0.0, deadline - time.monotonic())))
+                continue
+
+            if not dom_quiet:
+                break
+
+            # DOM quiet → done, unless new requests started meanwhile
+            tracker = getattr(page, "_net", None)
+            if tracker is None or tracker.busy_for() is None:
+                quiet = True
+                break
+
+    except Exception:
+        pass
+
+    if record:
+        _record(page, max_ms, time.monotonic() - start)
+
+    return quiet
+
+
+async def wait_for_event_or_quiet(page, event: asyncio.Event, max_ms: float, *, min_quiet_ms: int = MAX_QUIET_MS) -> bool:
+    """
+    Wait for `event` (e.g. "new document response") OR the page going quiet
+    without it, at most max_ms. Returns True if the event fired.
+    """
+    start = time.monotonic()
+
+    event_task = asyncio.create_task(event.wait())
+    quiet_task = asyncio.create_task(
+        wait_quiet(
+            page,
+            max_ms,
+            quiet_ms=max(min_quiet_ms, LATENCY.quiet_ms(urlparse(page.url).netloc)),
+            record=False,
+        )
+    )
+
+    try:
+        await asyncio.wait(
+            {event_task, quiet_task},
+            timeout=max_ms / 1000,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+    finally:
+        for task in (event_task, quiet_task):
+            task.cancel()
+
+    _record(page, max_ms, time.monotonic() - start)
+    return event.is_set()
+
+
+async def backoff_sleep(page, domain: str, cap_ms: int):
+    """Pause between goto retries: learned from the domain, capped by the old fixed pause."""
+    ms = LATENCY.backoff_ms(domain, cap_ms)
+    start = time.monotonic()
+    try:
+        await asyncio.sleep(ms / 1000)
+    finally:
+        _record(page, cap_ms, time.monotonic() - start)
+
+
+def wait_report(page) -> tuple[float, float, int]:
+    """(budget sec, spent sec, number of waits) recorded on this page."""
+    budget, spent, n = getattr(page, "_wait_stats", None) or (0.0, 0.0, 0)
+    return budget, spent, n
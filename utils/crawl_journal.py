@@ -0,0 +1,153 @@
+"""
+crawl_journal.py
+
+Append-only, per-college crawl journal (one JSON event per line) so a crawl
+can continue after a kernel crash / college timeout instead of starting over.
+
+Events:
+- start : college name + base url
+- page  : one merged BFS page → its norm url, depth, the link entries it
+          added to the Excel structure and the urls it enqueued
+- done  : the whole college finished
+
+Every event is written with flush + fsync. A half-written line (crash in the
+middle of a write) is ignored when the journal is loaded, and the next event
+after it starts on a fresh line, so a resumed crawl keeps journaling.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+
+class CrawlState:
+    """
+    BFS state rebuilt from a journal.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.done = False
+        self.visited = set()         # norm urls of pages already merged
+        self.entries = []            # [depth, category, row_bucket, entry, canon]
+        self.enqueued = []           # [url, depth, category, norm, canon] in enqueue order
+        self.excel_canon = set()
+        self.bfs_canon = set()
+        self.max_depth = -1
+
+    @property
+    def pages(self) -> int:
+        return len(self.visited)
+
+    def frontier(self) -> list:
+        """
+        Enqueued pages that were never merged, in their original BFS order.
+        """
+        out = []
+        seen = set()
+        for url, depth, category, norm, _canon in self.enqueued:
+            if norm in self.visited or norm in seen:
+                continue
+            seen.add(norm)
+            out.append((url, depth, category))
+        return out
+
+
+class CrawlJournal:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    # ----------------- writing -----------------
+
+    def _append(self, event: dict):
+        event["ts"] = time.time()
+        line = json.dumps(event, ensure_ascii=False)
+        if self._torn_tail():
+            line = "\n" + line
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _torn_tail(self) -> bool:
+        """True if the file does not end with a newline (crash mid-write)."""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return False
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except FileNotFoundError:
+            return False
+
+    def reset(self):
+        """Forget any previous crawl of this college."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def record_start(self, college_name: str, base_url: str):
+        self._append({"event": "start", "college": college_name, "base_url": base_url})
+
+    def record_page(self, url: str, norm: str, depth: int, entries: list, enqueued: list):
+        """
+        entries  : [category, row_bucket, entry, canon]
+        enqueued : [url, depth, category, norm, canon]
+        """
+        self._append({
+            "event": "page",
+            "url": url,
+            "norm": norm,
+            "depth": depth,
+            "entries": entries,
+            "enqueued": enqueued,
+        })
+
+    def record_done(self):
+        self._append({"event": "done"})
+
+    # ----------------- reading -----------------
+
+    def load(self) -> CrawlState:
+        state = CrawlState()
+
+        if not self.path.exists():
+            return state
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # torn write from a crash → skip it, later lines were appended after resume
+                    continue
+
+                kind = event.get("event")
+
+                if kind == "start":
+                    state.started = True
+
+                elif kind == "page":
+                    depth = event["depth"]
+                    state.visited.add(event["norm"])
+                    state.max_depth = max(state.max_depth, depth)
+
+                    for category, row_bucket, entry, canon in event.get("entries", []):
+                        state.entries.append([depth, category, row_bucket, entry, canon])
+                        state.excel_canon.add(canon)
+
+                    for item in event.get("enqueued", []):
+                        state.enqueued.append(item)
+                        state.bfs_canon.add(item[4])
+
+                elif kind == "done":
+                    state.done = True
+
+        return state
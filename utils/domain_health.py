@@ -0,0 +1,294 @@
+"""
+domain_health.py
+
+Per-domain health shared by the crawler (links_extracted_from_college.ipynb),
+the PDF downloader (utils/download_engine.py) and the URL validator
+(college_urls_data_generation_codes/eduValidUrlChecking.py).
+
+- AIMD request rate per domain: every success adds RATE_STEP requests/s (up
+  to MAX_RATE), every failure / throttle halves it (down to MIN_RATE).
+  delay(url) books the next start slot and says how long to wait for it.
+- circuit breaker: BREAKER_FAILURES consecutive failures (timeouts,
+  connection errors, 5xx) open it → delay() raises DomainOpen at once instead
+  of burning a full timeout per URL. After the cooldown (doubled on every
+  new trip, ≤ BREAKER_MAX_COOLDOWN_SEC) ONE probe request is let through
+  (half-open): success closes it, failure opens it again.
+- 429 / 503 + Retry-After: throttled() blocks the domain until Retry-After
+  (seconds or HTTP date) has passed; a throttling server is alive, so it
+  does not count towards the breaker.
+- state is kept in a JSON file and synced every SYNC_EVERY_SEC (read,
+  newest entry per domain wins, atomic replace), so a domain found dead by
+  one tool is skipped by the others too.
+
+Every method is thread safe (download threads) and never blocks on the
+network (asyncio crawler); callers sleep the returned delay themselves.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# ================= CONFIG =================
+
+START_RATE = 2.0               # requests/s of a domain seen for the first time
+MIN_RATE = 0.05                # = one request every 20 s
+MAX_RATE = 8.0
+RATE_STEP = 0.25               # additive increase per success
+RATE_DECREASE = 0.5            # multiplicative decrease per failure / throttle
+
+BREAKER_FAILURES = 3           # consecutive failures → open
+BREAKER_COOLDOWN_SEC = 120
+BREAKER_MAX_COOLDOWN_SEC = 30 * 60
+PROBE_TIMEOUT_SEC = 120        # half-open probe that never reported → next one may go
+
+DEFAULT_THROTTLE_SEC = 30      # 429 / 503 without Retry-After
+MAX_RETRY_AFTER_SEC = 15 * 60
+
+SYNC_EVERY_SEC = 30
+FORGET_AFTER_SEC = 7 * 24 * 3600   # entries not touched for a week are dropped
+
+# error texts meaning "the server could not be reached" (Chromium net::ERR_*,
+# requests / urllib3, Playwright / Selenium timeouts); anything else (aborted
+# downloads, bad URLs, 4xx) says nothing about the domain being down
+NETWORK_ERROR_MARKERS = (
+    "timeout", "timed out", "err_name_not_resolved", "err_name_resolution_failed",
+    "err_connection", "err_address_unreachable", "err_network", "err_internet_disconnected",
+    "err_empty_response", "err_ssl_protocol_error", "err_tunnel",
+    "name or service not known", "nodename nor servname", "getaddrinfo failed",
+    "connection refused", "connection reset", "connection aborted",
+    "max retries exceeded", "remote end closed",
+)
+
+PERSISTED_KEYS = ("rate", "failures", "state", "open_until", "trips", "blocked_until", "updated")
+
+
+class DomainOpen(Exception):
+    """Circuit of the domain is open → fail fast."""
+
+    def __init__(self, domain: str, retry_in: float):
+        super().__init__(f"{domain} unavailable (circuit open, next probe in {retry_in:.0f}s)")
+        self.domain = domain
+        self.retry_in = retry_in
+
+
+def domain_key(url_or_domain: str) -> str:
+    """URL or host → lowercase host without "www." and port."""
+    value = (url_or_domain or "").strip()
+    host = urlparse(value).hostname if "://" in value else value.split("/", 1)[0].split(":", 1)[0]
+    return (host or "").lower().removeprefix("www.")
+
+
+def parse_retry_after(value) -> float | None:
+    """Retry-After header (delta seconds or HTTP date) → seconds from now."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def is_network_error(error) -> bool:
+    """Exception / error text → True if it means the host is unreachable."""
+    text = str(error).lower()
+    return any(m in text for m in NETWORK_ERROR_MARKERS)
+
+
+def _new_entry(now: float) -> dict:
+    return {
+        "rate": START_RATE,
+        "failures": 0,
+        "state": "closed",         # closed | open | half_open
+        "open_until": 0.0,
+        "trips": 0,
+        "blocked_until": 0.0,
+        "updated": now,
+        # process-local
+        "next_at": 0.0,
+        "probe_until": 0.0,
+    }
+
+
+class DomainHealth:
+    def __init__(self, state_file=None, *, sync_every_sec: float = SYNC_EVERY_SEC):
+        self.state_file = str(state_file) if state_file else None
+        self.sync_every_sec = sync_every_sec
+
+        self._domains = {}
+        self._lock = threading.Lock()
+        self._last_sync = 0.0
+        self.stats = {"fast_failed": 0, "throttled": 0, "trips": 0, "waited_sec": 0.0}
+
+        if self.state_file:
+            with self._lock:
+                self._merge_from_disk()
+
+    # ----------------- before a request -----------------
+
+    def delay(self, url: str) -> float:
+        """
+        Seconds the caller must wait before requesting url (its rate slot /
+        Retry-After). Raises DomainOpen if the domain is known to be down.
+        """
+        now = time.time()
+        key = domain_key(url)
+
+        with self._lock:
+            e = self._entry(key, now)
+
+            if e["state"] == "open":
+                if now < e["open_until"]:
+                    self.stats["fast_failed"] += 1
+                    raise DomainOpen(key, e["open_until"] - now)
+                e["state"] = "half_open"
+                e["probe_until"] = 0.0
+
+            if e["state"] == "half_open":
+                if now < e["probe_until"]:
+                    # the probe is still running → nobody else goes
+                    self.stats["fast_failed"] += 1
+                    raise DomainOpen(key, e["probe_until"] - now)
+                e["probe_until"] = now + PROBE_TIMEOUT_SEC
+
+            start = max(now, e["next_at"], e["blocked_until"])
+            e["next_at"] = start + 1.0 / e["rate"]
+
+            wait = start - now
+            self.stats["waited_sec"] += wait
+            return wait
+
+    def is_open(self, url: str) -> bool:
+        """True while the breaker of the domain rejects requests (no slot booked)."""
+        with self._lock:
+            e = self._domains.get(domain_key(url))
+            return bool(e) and e["state"] == "open" and time.time() < e["open_until"]
+
+    # ----------------- after a request -----------------
+
+    def success(self, url: str):
+        """The server answered (any status that is not a throttle / 5xx)."""
+        with self._lock:
+            now = time.time()
+            e = self._entry(domain_key(url), now)
+            e.update(
+                failures=0, state="closed", trips=0, probe_until=0.0, updated=now,
+                rate=min(MAX_RATE, e["rate"] + RATE_STEP),
+            )
+            self._maybe_sync(now)
+
+    def failure(self, url: str):
+        """Timeout, connection / DNS / TLS error or 5xx."""
+        with self._lock:
+            now = time.time()
+            key = domain_key(url)
+            e = self._entry(key, now)
+            e["failures"] += 1
+            e["rate"] = max(MIN_RATE, e["rate"] * RATE_DECREASE)
+            e["updated"] = now
+
+            if e["state"] == "half_open" or e["failures"] >= BREAKER_FAILURES:
+                if e["state"] != "open":
+                    self._trip(key, e, now)
+
+            self._maybe_sync(now)
+
+    def throttled(self, url: str, retry_after: float | None = None):
+        """429 / 503: slow down and wait Retry-After (server is alive)."""
+        with self._lock:
+            now = time.time()
+            e = self._entry(domain_key(url), now)
+            wait = DEFAULT_THROTTLE_SEC if retry_after is None else retry_after
+            e.update(
+                failures=0, state="closed", probe_until=0.0, updated=now,
+                rate=max(MIN_RATE, e["rate"] * RATE_DECREASE),
+                blocked_until=max(e["blocked_until"], now + min(wait, MAX_RETRY_AFTER_SEC)),
+            )
+            self.stats["throttled"] += 1
+            self._maybe_sync(now)
+
+    # ----------------- shared state -----------------
+
+    def sync(self):
+        """Merge with the state file (newest entry per domain wins) and write it back."""
+        with self._lock:
+            self._sync(time.time())
+
+    def summary(self) -> dict:
+        """{"tracked", "open", "throttled"} domain counts right now."""
+        now = time.time()
+        with self._lock:
+            entries = list(self._domains.values())
+        return {
+            "tracked": len(entries),
+            "open": sum(1 for e in entries if e["state"] == "open" and now < e["open_until"]),
+            "throttled": sum(1 for e in entries if now < e["blocked_until"]),
+        }
+
+    # ----------------- helpers (lock held) -----------------
+
+    def _entry(self, key: str, now: float) -> dict:
+        e = self._domains.get(key)
+        if e is None:
+            e = self._domains[key] = _new_entry(now)
+        return e
+
+    def _trip(self, key: str, e: dict, now: float):
+        e["trips"] += 1
+        cooldown = min(BREAKER_MAX_COOLDOWN_SEC, BREAKER_COOLDOWN_SEC * 2 ** (e["trips"] - 1))
+        e.update(state="open", open_until=now + cooldown, probe_until=0.0)
+        self.stats["trips"] += 1
+        print(f"[HEALTH] {key} → circuit OPEN for {cooldown:.0f}s ({e['failures']} failure(s) in a row)")
+
+    def _maybe_sync(self, now: float):
+        if self.state_file and now - self._last_sync >= self.sync_every_sec:
+            self._sync(now)
+
+    def _sync(self, now: float):
+        if not self.state_file:
+            return
+        self._last_sync = now
+        self._merge_from_disk()
+
+        data = {
+            key: {k: e[k] for k in PERSISTED_KEYS}
+            for key, e in self._domains.items()
+            if now - e["updated"] < FORGET_AFTER_SEC
+        }
+
+        dirn = os.path.dirname(self.state_file) or "."
+        try:
+            os.makedirs(dirn, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=dirn, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.state_file)
+        except OSError as e:
+            print(f"[HEALTH] could not save {self.state_file}: {e}")
+
+    def _merge_from_disk(self):
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                disk = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for key, saved in disk.items():
+            if not isinstance(saved, dict):
+                continue
+            e = self._domains.get(key)
+            if e is not None and e["updated"] >= saved.get("updated", 0):
+                continue
+            if e is None:
+                e = self._domains[key] = _new_entry(0.0)
+            e.update({k: saved[k] for k in PERSISTED_KEYS if k in saved})
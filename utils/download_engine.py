@@ -0,0 +1,460 @@
+"""
+download_engine.py
+
+Concurrent, resumable file downloader (used by pdfs_from_links.ipynb).
+
+- one requests.Session with a large per-host connection pool → keep-alive,
+  no new TCP/TLS handshake per file
+- bounded concurrency: `max_workers` threads overall, `per_domain` at the
+  same time on one host
+- retries with exponential backoff (+ Retry-After) on timeouts, connection
+  errors, any other requests / OS error, 429 and 5xx
+- resumable: data goes to "<file>.part"; a retry (or the next run) continues
+  with a Range + If-Range request (validator kept in "<file>.part.meta"; a
+  .part without one is thrown away); the finished file is moved into place
+  with os.replace, so a half-written file never has the final name
+- optional DownloadStore (utils/download_store.py): conditional requests
+  from the persistent index, content-addressed blobs, hardlinked targets
+- optional DomainHealth (utils/domain_health.py): AIMD pacing per host,
+  Retry-After blocks shared with the crawler, hosts with an open circuit
+  fail at once instead of after every retry's timeout
+- with a store, one URL is fetched by one thread at a time (its .part file
+  is per URL); other targets of the same URL wait and then only link the
+  stored blob
+
+Usage:
+    engine = DownloadEngine(max_workers=16, per_domain=4, headers=HEADERS)
+    engine.submit(url, "out/a.pdf", on_done=print)
+    engine.wait()          # all submitted downloads finished
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.domain_health import DomainOpen, parse_retry_after
+
+# ================= CONFIG =================
+
+MAX_WORKERS = 16
+PER_DOMAIN = 4
+TIMEOUT = 90                 # read timeout (seconds)
+CONNECT_TIMEOUT = 15
+RETRIES = 3                  # extra attempts after the first one
+BACKOFF_SEC = 1.5            # 1.5 s, 3 s, 6 s ... (+ jitter)
+MAX_BACKOFF_SEC = 60
+CHUNK_SIZE = 64 * 1024
+PART_SUFFIX = ".part"
+META_SUFFIX = ".meta"         # ETag / Last-Modified of the .part next to it
+
+RETRY_STATUS = {408, 425, 429, 500, 502, 503, 504}
+THROTTLE_STATUS = {429, 503}
+
+# the server could not be reached (→ DomainHealth.failure)
+NETWORK_ERRORS = (requests.Timeout, requests.ConnectionError, requests.exceptions.ChunkedEncodingError)
+# the request never left (bad link) → nothing to report about the server
+REQUEST_BUILD_ERRORS = (requests.exceptions.InvalidURL, requests.exceptions.MissingSchema, requests.exceptions.InvalidSchema)
+
+
+class DownloadError(Exception):
+    def __init__(self, message, retry: bool, retry_after: float | None = None, status: int | None = None):
+        super().__init__(message)
+        self.retry = retry
+        self.retry_after = retry_after
+        self.status = status
+
+
+def _retry_after_sec(resp) -> float | None:
+    return parse_retry_after(resp.headers.get("Retry-After"))
+
+
+def _load_part_meta(part: str) -> dict:
+    try:
+        with open(part + META_SUFFIX, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_part_meta(part: str, etag: str | None, last_modified: str | None):
+    if not (etag or last_modified):
+        _drop_part_meta(part)
+        return
+    with open(part + META_SUFFIX, "w", encoding="utf-8") as f:
+        json.dump({"etag": etag, "last_modified": last_modified}, f)
+
+
+def _drop_part_meta(part: str):
+    try:
+        os.remove(part + META_SUFFIX)
+    except FileNotFoundError:
+        pass
+
+
+def _if_range(meta: dict) -> str | None:
+    """If-Range value for a resume; weak ETags are not allowed there."""
+    etag = meta.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return meta.get("last_modified")
+
+
+class DownloadEngine:
+    def __init__(
+        self,
+        max_workers: int = MAX_WORKERS,
+        per_domain: int = PER_DOMAIN,
+        *,
+        headers: dict | None = None,
+        timeout: float = TIMEOUT,
+        retries: int = RETRIES,
+        backoff_sec: float = BACKOFF_SEC,
+        chunk_size: int = CHUNK_SIZE,
+        store=None,
+        health=None,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.per_domain = max(1, per_domain)
+        self.timeout = (min(CONNECT_TIMEOUT, timeout), timeout)
+        self.retries = retries
+        self.backoff_sec = backoff_sec
+        self.chunk_size = chunk_size
+        self.store = store
+        self.health = health
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers,
+            pool_maxsize=self.max_workers,
+            max_retries=0,              # retries are done here (with resume)
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+        # raw bytes on the wire, so Range offsets / Content-Length match the file
+        self.session.headers["Accept-Encoding"] = "identity"
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="download",
+        )
+        self._domain_slots = defaultdict(lambda: threading.BoundedSemaphore(self.per_domain))
+        self._lock = threading.Lock()
+        self._inflight = set()           # target paths being downloaded
+        self._url_locks = {}             # url → [lock, users] (single flight per url)
+        self._futures = []
+
+        self.stats = {
+            "ok": 0, "failed": 0, "bytes": 0, "resumed": 0, "unchanged": 0, "cached": 0,
+            "domain_down": 0,
+        }
+
+    # ----------------- public API -----------------
+
+    def submit(self, url: str, path: str, on_done=None):
+        """
+        Queue one download. Returns a Future (result: dict, see download()),
+        or None if the same target path is already queued.
+        on_done(result) is called from the worker thread when it finishes.
+        """
+        path = os.path.abspath(path)
+
+        with self._lock:
+            if path in self._inflight:
+                return None
+            self._inflight.add(path)
+
+        def job():
+            try:
+                result = self.download(url, path)
+            finally:
+                with self._lock:
+                    self._inflight.discard(path)
+
+            if on_done is not None:
+                try:
+                    on_done(result)
+                except Exception:
+                    pass
+            return result
+
+        future = self._executor.submit(job)
+        with self._lock:
+            self._futures.append(future)
+        return future
+
+    def wait(self):
+        """Block until every submitted download has finished."""
+        while True:
+            with self._lock:
+                pending = [f for f in self._futures if not f.done()]
+                self._futures = pending
+            if not pending:
+                if self.health is not None:
+                    self.health.sync()
+                return
+            for f in pending:
+                try:
+                    f.result()
+                except Exception:
+                    pass
+
+    def close(self):
+        self.wait()
+        self._executor.shutdown(wait=True)
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----------------- one file -----------------
+
+    def download(self, url: str, path: str) -> dict:
+        """
+        Download url → path (blocking, with retries / resume).
+        Returns {"url", "path", "ok", "bytes", "attempts", "error", "status"}
+        status: "downloaded" | "unchanged" (304) | "cached" (already fetched
+        in this run) | "exists" (no store, file already there) | None (failed,
+        "error" starts with "domain down" if the host's circuit is open)
+        With a store, "path" may differ from the requested one (name collision).
+        """
+        if self.store is None:
+            return self._download(url, path)
+
+        # the .part is per url → never two fetches of one url at once; the
+        # next target of the url finds it fresh in the store and only links
+        with self._url_flight(url):
+            return self._download(url, path)
+
+    def _download(self, url: str, path: str) -> dict:
+        result = {
+            "url": url, "path": path, "ok": False, "bytes": 0,
+            "attempts": 0, "error": None, "status": None,
+        }
+        store = self.store
+
+        if store is None:
+            if os.path.exists(path):
+                result.update(ok=True, bytes=os.path.getsize(path), status="exists")
+                return result
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            part = path + PART_SUFFIX
+            rec = None
+            conditional = {}
+        else:
+            rec = store.lookup(url)
+            if store.is_fresh(rec):
+                result.update(
+                    ok=True, bytes=rec["size"], status="cached",
+                    path=store.link(rec["sha256"], path, url),
+                )
+                self._count("cached", 1)
+                return result
+            part = store.part_path(url)
+            conditional = store.conditional_headers(rec)
+
+        domain = urlparse(url).netloc
+        health = self.health
+
+        for attempt in range(self.retries + 1):
+            result["attempts"] = attempt + 1
+            try:
+                with self._domain_slots[domain]:
+                    if health is not None:
+                        time.sleep(health.delay(url))
+                    fetched = self._fetch_to_part(url, part, conditional)
+
+                if health is not None:
+                    health.success(url)
+
+                if fetched["not_modified"]:
+                    store.touch(url)
+                    result.update(
+                        ok=True, bytes=rec["size"], status="unchanged",
+                        path=store.link(rec["sha256"], path, url),
+                    )
+                    self._count("unchanged", 1)
+                    return result
+
+                if store is None:
+                    os.replace(part, path)
+                else:
+                    sha = store.ingest(url, part, fetched["etag"], fetched["last_modified"])
+                    result["path"] = store.link(sha, path, url)
+                _drop_part_meta(part)
+
+                result.update(ok=True, bytes=fetched["bytes"], status="downloaded")
+                self._count("ok", 1)
+                self._count("bytes", fetched["bytes"])
+                return result
+
+            except DomainOpen as e:
+                result["error"] = f"domain down: {e}"
+                self._count("domain_down", 1)
+                break
+
+            except DownloadError as e:
+                result["error"] = str(e)
+                self._report_health(url, e)
+                if not e.retry or attempt >= self.retries:
+                    break
+                self._sleep_backoff(attempt, e.retry_after)
+
+            except (requests.RequestException, OSError) as e:
+                # keep the .part → next attempt resumes
+                result["error"] = f"{type(e).__name__}: {e}"
+                self._report_request_error(url, e)
+                if attempt >= self.retries:
+                    break
+                self._sleep_backoff(attempt, None)
+
+            except Exception as e:
+                # programming error → retrying would fail the same way
+                result["error"] = f"{type(e).__name__}: {e}"
+                break
+
+        self._count("failed", 1)
+        return result
+
+    def _fetch_to_part(self, url: str, part: str, conditional: dict) -> dict:
+        """
+        GET into `part` (Range-resumed if it exists and its validator is known).
+        Returns {"bytes", "not_modified", "etag", "last_modified"}.
+        """
+        have = os.path.getsize(part) if os.path.exists(part) else 0
+        meta = _load_part_meta(part) if have else {}
+        validator = _if_range(meta)
+
+        if have and validator is None:
+            # nothing proves the .part is the same file version → start over
+            os.remove(part)
+            _drop_part_meta(part)
+            have = 0
+
+        if have:
+            # a partial body means the last answer was 200 → no revalidation;
+            # If-Range: the server sends the whole new file if it changed
+            headers = {"Range": f"bytes={have}-", "If-Range": validator}
+        else:
+            headers = dict(conditional)
+
+        out = {"bytes": 0, "not_modified": False, "etag": None, "last_modified": None}
+
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as r:
+            out["etag"] = r.headers.get("ETag") or meta.get("etag")
+            out["last_modified"] = r.headers.get("Last-Modified") or meta.get("last_modified")
+
+            if r.status_code == 304 and not have and conditional:
+                out["not_modified"] = True
+                return out
+
+            if r.status_code == 416 and have:
+                # the .part already holds the whole file (or is junk)
+                total = r.headers.get("Content-Range", "").rsplit("/", 1)[-1]
+                if total.isdigit() and int(total) == have:
+                    out["bytes"] = have
+                    return out
+                os.remove(part)
+                _drop_part_meta(part)
+                raise DownloadError("HTTP 416 on resume, restarting", retry=True)
+
+            if r.status_code in RETRY_STATUS:
+                raise DownloadError(
+                    f"HTTP {r.status_code}", retry=True,
+                    retry_after=_retry_after_sec(r), status=r.status_code,
+                )
+
+            if r.status_code >= 400:
+                raise DownloadError(f"HTTP {r.status_code}", retry=False, status=r.status_code)
+
+            if have and r.status_code == 206:
+                mode = "ab"
+                self._count("resumed", 1)
+            else:
+                # server ignored the Range header / the file changed → start over
+                mode = "wb"
+                have = 0
+                out["etag"] = r.headers.get("ETag")
+                out["last_modified"] = r.headers.get("Last-Modified")
+
+            expected = r.headers.get("Content-Length")
+            expected = int(expected) if expected and expected.isdigit() else None
+
+            written = 0
+            os.makedirs(os.path.dirname(part) or ".", exist_ok=True)
+            if mode == "wb":
+                _save_part_meta(part, out["etag"], out["last_modified"])
+            with open(part, mode) as f:
+                for chunk in r.iter_content(self.chunk_size):
+                    if chunk:
+                        f.write(chunk)
+                        written += len(chunk)
+
+        if expected is not None and written < expected:
+            raise requests.exceptions.ChunkedEncodingError(
+                f"incomplete body ({written} of {expected} bytes)"
+            )
+
+        out["bytes"] = have + written
+        return out
+
+    # ----------------- helpers -----------------
+
+    @contextmanager
+    def _url_flight(self, url: str):
+        with self._lock:
+            entry = self._url_locks.setdefault(url, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._url_locks[url]
+
+    def _report_health(self, url: str, e: DownloadError):
+        health = self.health
+        if health is None:
+            return
+        if e.status in THROTTLE_STATUS:
+            health.throttled(url, e.retry_after)
+        elif e.status is not None and e.status >= 500:
+            health.failure(url)
+        else:
+            # 4xx / broken resume → the server itself answered
+            health.success(url)
+
+    def _report_request_error(self, url: str, e: Exception):
+        health = self.health
+        if health is None or not isinstance(e, requests.RequestException):
+            return      # local OSError (disk, .part moved) says nothing about the server
+        if isinstance(e, NETWORK_ERRORS):
+            health.failure(url)
+        elif not isinstance(e, REQUEST_BUILD_ERRORS):
+            # answered, but unusable (redirect loop, bad encoding ...)
+            health.success(url)
+
+    def _sleep_backoff(self, attempt: int, retry_after: float | None):
+        delay = self.backoff_sec * (2 ** attempt) + random.uniform(0, self.backoff_sec)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        time.sleep(min(delay, MAX_BACKOFF_SEC))
+
+    def _count(self, key: str, n: int):
+        with self._lock:
+            self.stats[key] += n
@@ -0,0 +1,250 @@
+"""
+download_store.py
+
+Persistent, content-addressed store for downloaded files.
+
+- index.sqlite : url  → etag / last_modified / size / sha256 / fetched_at
+                 path → sha256 / url (which url a visible file belongs to)
+- blobs/ab/abcdef....pdf : every distinct content exactly once (sha256 name)
+- the per-college / per-year files are hardlinks to the blobs (symlink or
+  copy where hardlinks are not possible)
+
+Re-runs send conditional requests (If-None-Match / If-Modified-Since) built
+from the index and only re-link on 304. Bodies the crawler's browser already
+received can be put in with ingest_bytes(). The same content under different
+urls / colleges is stored once. Two different files that map to the same
+visible name never overwrite each other: the second one gets a
+"_<sha8>" suffix.
+"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url            TEXT PRIMARY KEY,
+    etag           TEXT,
+    last_modified  TEXT,
+    size           INTEGER,
+    sha256         TEXT NOT NULL,
+    fetched_at     REAL
+);
+CREATE TABLE IF NOT EXISTS paths (
+    path    TEXT PRIMARY KEY,
+    sha256  TEXT NOT NULL,
+    url     TEXT
+);
+"""
+
+LINK_MODES = ("hardlink", "symlink", "copy")
+
+
+def sha256_of_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class DownloadStore:
+    def __init__(self, root: str, link_mode: str = "hardlink", max_age_sec: float | None = None):
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"link_mode must be one of {LINK_MODES}, got {link_mode!r}")
+
+        self.root = os.path.abspath(root)
+        self.blob_dir = os.path.join(self.root, "blobs")
+        self.tmp_dir = os.path.join(self.root, "tmp")
+        self.db_path = os.path.join(self.root, "index.sqlite")
+        self.link_mode = link_mode
+
+        # urls fetched / revalidated after this moment are not asked again in this run
+        self.session_start = time.time()
+        # ... nor those fetched less than max_age_sec ago (e.g. captured by the crawler)
+        self.max_age_sec = max_age_sec
+
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    # ----------------- connection helpers -----------------
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=60)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ----------------- index -----------------
+
+    def lookup(self, url: str) -> dict | None:
+        """Index record of url, only if its blob still exists."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM urls WHERE url = ?", (url,)).fetchone()
+
+        if row is None:
+            return None
+
+        rec = dict(row)
+        if not os.path.exists(self.blob_path(rec["sha256"])):
+            return None
+        return rec
+
+    def is_fresh(self, rec: dict | None) -> bool:
+        """Fetched or revalidated during this run (or within max_age_sec) → no request needed."""
+        if not rec:
+            return False
+        fetched_at = rec.get("fetched_at") or 0
+        if fetched_at >= self.session_start:
+            return True
+        return self.max_age_sec is not None and time.time() - fetched_at < self.max_age_sec
+
+    def conditional_headers(self, rec: dict | None) -> dict:
+        headers = {}
+        if not rec:
+            return headers
+        if rec.get("etag"):
+            headers["If-None-Match"] = rec["etag"]
+        if rec.get("last_modified"):
+            headers["If-Modified-Since"] = rec["last_modified"]
+        return headers
+
+    def touch(self, url: str):
+        """304 Not Modified → the stored content is still current."""
+        with self._lock, self._connect() as conn:
+            conn.execute("UPDATE urls SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    # ----------------- blobs -----------------
+
+    def blob_path(self, sha: str, suffix: str = ".pdf") -> str:
+        return os.path.join(self.blob_dir, sha[:2], sha + suffix)
+
+    def part_path(self, url: str) -> str:
+        """Per-url temp file (kept between attempts / runs for Range resume)."""
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.tmp_dir, key + ".part")
+
+    def ingest(self, url: str, tmp_path: str, etag: str | None = None, last_modified: str | None = None) -> str:
+        """
+        Move a finished download into the blob store (dropped if the content
+        is already stored) and index it. Returns its sha256.
+        """
+        sha = sha256_of_file(tmp_path)
+        size = os.path.getsize(tmp_path)
+        blob = self.blob_path(sha)
+
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        if os.path.exists(blob):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, blob)
+
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO urls (url, etag, last_modified, size, sha256, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET etag = excluded.etag, "
+                "last_modified = excluded.last_modified, size = excluded.size, "
+                "sha256 = excluded.sha256, fetched_at = excluded.fetched_at",
+                (url, etag, last_modified, size, sha, time.time()),
+            )
+
+        return sha
+
+    def ingest_bytes(self, url: str, data: bytes, etag: str | None = None, last_modified: str | None = None) -> str:
+        """Same as ingest(), for a body that is already in memory (browser capture)."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir, suffix=".capture")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            return self.ingest(url, tmp_path, etag, last_modified)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    # ----------------- visible files -----------------
+
+    def link(self, sha: str, target: str, url: str | None = None) -> str:
+        """
+        Make `target` show blob `sha`. Returns the path really used:
+        - target already shows this content → unchanged
+        - target belongs to the same url (content changed) → replaced
+        - target holds another file → "<stem>_<sha8><ext>" next to it
+        """
+        target = os.path.abspath(target)
+
+        with self._lock:
+            final = self._pick_path(sha, target, url)
+
+            if not (os.path.exists(final) and self._path_sha(final) == sha):
+                self._place(self.blob_path(sha), final)
+
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO paths (path, sha256, url) VALUES (?, ?, ?)",
+                    (final, sha, url),
+                )
+
+        return final
+
+    def _path_sha(self, path: str) -> str | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT sha256 FROM paths WHERE path = ?", (path,)).fetchone()
+        if row:
+            return row["sha256"]
+        return sha256_of_file(path) if os.path.isfile(path) else None
+
+    def _path_url(self, path: str) -> str | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT url FROM paths WHERE path = ?", (path,)).fetchone()
+        return row["url"] if row else None
+
+    def _pick_path(self, sha: str, target: str, url: str | None) -> str:
+        if not os.path.exists(target):
+            return target
+
+        if self._path_sha(target) == sha:
+            return target
+
+        if url is not None and self._path_url(target) == url:
+            return target          # same url, new content → refresh in place
+
+        stem, ext = os.path.splitext(target)
+        return f"{stem}_{sha[:8]}{ext}"
+
+    def _place(self, blob: str, final: str):
+        os.makedirs(os.path.dirname(final), exist_ok=True)
+        tmp = final + ".linktmp"
+        if os.path.lexists(tmp):
+            os.remove(tmp)
+
+        modes = LINK_MODES[LINK_MODES.index(self.link_mode):]
+        for mode in modes:
+            try:
+                if mode == "hardlink":
+                    os.link(blob, tmp)
+                elif mode == "symlink":
+                    os.symlink(blob, tmp)
+                else:
+                    shutil.copyfile(blob, tmp)
+                break
+            except OSError:
+                if os.path.lexists(tmp):
+                    os.remove(tmp)
+                if mode == modes[-1]:
+                    raise
+
+        os.replace(tmp, final)
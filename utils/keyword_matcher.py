@@ -0,0 +1,269 @@
+"""
+keyword_matcher.py
+
+Category keyword matching compiled ONCE from CATEGORY_KEYWORDS.
+
+The crawler used to loop over every keyword for every discovered link,
+re-normalizing each keyword and building its "_kw_" / "_kw" / "kw_" variants
+on every call. A keyword matches a normalized string when one of those
+variants is a substring, i.e. when the keyword touches a "_" on its left OR
+on its right. This module answers the same question with:
+
+- any_keyword(norm)      : one combined regex  _(?:kw1|kw2|..)|(?:kw1|kw2|..)_
+- categories(norm)       : every matching category in one pass over the "_"
+                           positions of the string (forward + reverse keyword
+                           tries), cached per string
+- criterion_match(text)  : shared, cached CRITERION / METRIC regex search
+
+Micro-benchmark (keywords + real URLs are read from the crawler notebook):
+    python -m utils.keyword_matcher
+"""
+
+import re
+from functools import lru_cache
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+_MULTI_UNDERSCORE = re.compile(r"_+")
+
+CACHE_SIZE = 65536
+
+
+def normalize_token(s: str) -> str:
+    """
+    Lowercase, every non-alphanumeric char → "_", collapse "_" runs, strip "_".
+    """
+    if not s:
+        return ""
+    s = _NON_ALNUM.sub("_", s.lower())
+    return _MULTI_UNDERSCORE.sub("_", s).strip("_")
+
+
+def _build_trie(words):
+    """
+    words: {word: set(categories)} → nested dicts, categories stored under None.
+    """
+    root = {}
+    for word, cats in words.items():
+        node = root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node.setdefault(None, set()).update(cats)
+    return root
+
+
+def _alternation(words) -> str:
+    # longest first, so the combined pattern prefers the most specific keyword
+    return "|".join(re.escape(w) for w in sorted(words, key=lambda w: (-len(w), w)))
+
+
+class KeywordMatcher:
+    def __init__(self, category_keywords: dict, criterion_regex=None, cache_size: int = CACHE_SIZE):
+        self.category_names = list(category_keywords)
+
+        # normalized keyword → categories it belongs to
+        self.keywords = {}
+        for cat, kws in category_keywords.items():
+            for kw in kws:
+                norm_kw = normalize_token(kw) if kw else ""
+                if norm_kw:
+                    self.keywords.setdefault(norm_kw, set()).add(cat)
+
+        self._any_regex = self._compile(self.keywords)
+
+        self._forward = _build_trie(self.keywords)
+        self._reverse = _build_trie({w[::-1]: c for w, c in self.keywords.items()})
+
+        self.criterion_regex = criterion_regex
+
+        if cache_size:
+            self.categories = lru_cache(maxsize=cache_size)(self.categories)
+            self.criterion_match = lru_cache(maxsize=cache_size)(self.criterion_match)
+
+    @staticmethod
+    def _compile(words):
+        if not words:
+            return None
+        alts = _alternation(words)
+        return re.compile(rf"_(?:{alts})|(?:{alts})_")
+
+    # ----------------- matching -----------------
+
+    def any_keyword(self, norm: str) -> bool:
+        """Does any category keyword touch a "_" in the normalized string?"""
+        return bool(self._any_regex and self._any_regex.search(norm))
+
+    def categories(self, norm: str) -> frozenset:
+        """
+        All categories with a keyword that touches a "_" in `norm`.
+        Single pass: at every "_" walk the forward trie (keyword starts right
+        after it) and the reverse trie (keyword ends right before it).
+        """
+        found = set()
+        n = len(norm)
+        i = norm.find("_")
+
+        while i != -1:
+            node = self._forward
+            j = i + 1
+            while j < n:
+                node = node.get(norm[j])
+                if node is None:
+                    break
+                cats = node.get(None)
+                if cats:
+                    found |= cats
+                j += 1
+
+            node = self._reverse
+            j = i - 1
+            while j >= 0:
+                node = node.get(norm[j])
+                if node is None:
+                    break
+                cats = node.get(None)
+                if cats:
+                    found |= cats
+                j -= 1
+
+            i = norm.find("_", i + 1)
+
+        return frozenset(found)
+
+    def criterion_match(self, combined: str):
+        """CRITERION / METRIC regex search on the lowercased string (or None)."""
+        if self.criterion_regex is None:
+            return None
+        return self.criterion_regex.search(combined.lower())
+
+
+# =====================================================================
+# MICRO-BENCHMARK
+# =====================================================================
+
+def _legacy_any_keyword(category_keywords, combined):
+    """The per-call keyword loop the crawler used before this module."""
+    for kws in category_keywords.values():
+        for kw in kws:
+            if not kw:
+                continue
+            norm_kw = normalize_token(kw)
+            if not norm_kw:
+                continue
+            for variant in {f"_{norm_kw}_", f"_{norm_kw}", f"{norm_kw}_"}:
+                if variant in combined:
+                    return True
+    return False
+
+
+def _legacy_categories(category_keywords, combined):
+    out = set()
+    for cat, kws in category_keywords.items():
+        for kw in kws:
+            norm_kw = normalize_token(kw)
+            if not norm_kw:
+                continue
+            if any(v in combined for v in (f"_{norm_kw}_", f"_{norm_kw}", f"{norm_kw}_")):
+                out.add(cat)
+                break
+    return frozenset(out)
+
+
+def _load_from_notebook(notebook_path):
+    """CATEGORY_KEYWORDS + every URL printed in the saved cell outputs."""
+    import ast
+    import json
+
+    with open(notebook_path, "r", encoding="utf-8") as f:
+        nb = json.load(f)
+
+    category_keywords = None
+    urls = set()
+
+    for cell in nb["cells"]:
+        if cell.get("cell_type") != "code":
+            continue
+
+        src = "".join(cell["source"])
+        if category_keywords is None and "CATEGORY_KEYWORDS = {" in src:
+            try:
+                tree = ast.parse(src)
+            except SyntaxError:
+                tree = None
+            for node in getattr(tree, "body", []):
+                if (
+                    isinstance(node, ast.Assign)
+                    and any(getattr(t, "id", None) == "CATEGORY_KEYWORDS" for t in node.targets)
+                ):
+                    category_keywords = ast.literal_eval(node.value)
+
+        for out in cell.get("outputs", []):
+            text = "".join(out.get("text", []))
+            urls.update(re.findall(r"https?://[^\s'\"|,)]+", text))
+
+    return category_keywords, sorted(urls)
+
+
+def _bench(fn, items, repeat):
+    import time
+
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for it in items:
+            fn(it)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(items) * 1e6   # µs per link
+
+
+def main():
+    import argparse
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Benchmark the compiled keyword matcher.")
+    parser.add_argument(
+        "--notebook",
+        default=str(Path(__file__).resolve().parent.parent / "links_extracted_from_college.ipynb"),
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    category_keywords, urls = _load_from_notebook(args.notebook)
+    if not category_keywords or not urls:
+        raise SystemExit("[ERROR] CATEGORY_KEYWORDS or URLs not found in the notebook")
+
+    # anchor text is not printed by the crawler → use the last path segment
+    corpus = [
+        normalize_token(f"_{u.rstrip('/').rsplit('/', 1)[-1]}_{u}_")
+        for u in urls
+    ]
+
+    # cache off → every call does the real work
+    matcher = KeywordMatcher(category_keywords, cache_size=0)
+
+    # results must be identical to the old loops
+    for norm in corpus:
+        assert matcher.any_keyword(norm) == _legacy_any_keyword(category_keywords, norm), norm
+        assert matcher.categories(norm) == _legacy_categories(category_keywords, norm), norm
+
+    n_kw = sum(len(v) for v in category_keywords.values())
+    print(f"[BENCH] {len(corpus)} real URLs, {len(category_keywords)} categories, {n_kw} keywords")
+    print(f"[BENCH] {sum(map(matcher.any_keyword, corpus))} link(s) match a category keyword")
+
+    rows = [
+        ("any keyword  (is_category_related / should_enqueue_url)",
+         lambda s: _legacy_any_keyword(category_keywords, s), matcher.any_keyword),
+        ("categories   (matches_category_own, all categories)",
+         lambda s: _legacy_categories(category_keywords, s), matcher.categories),
+    ]
+
+    for label, old, new in rows:
+        t_old = _bench(old, corpus, args.repeat)
+        t_new = _bench(new, corpus, args.repeat)
+        print(
+            f"[BENCH] {label}: {t_old:8.2f} µs → {t_new:6.2f} µs per link "
+            f"({t_old / t_new:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
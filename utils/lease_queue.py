@@ -0,0 +1,223 @@
+"""
+lease_queue.py
+
+SQLite-file work queue with leases, used to spread one college list over
+any number of worker processes / machines.
+
+How it works:
+- The coordinator seeds every college once (INSERT OR IGNORE, so seeding the
+  same list again from another node is harmless).
+- A worker claims ONE job at a time. The claim is a lease: it expires after
+  `lease_sec` unless the worker keeps calling heartbeat().
+- Jobs end as "done" or "failed". A job whose lease expired (worker crashed,
+  machine rebooted, ...) is handed to the next worker that asks for work.
+- A job is tried at most `max_attempts` times, then it is marked "failed".
+
+Several machines can share the queue when the .sqlite file lives on a disk
+with working file locks (local disk, SMB, NFSv4 with locking).
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+
+# ================= CONFIG =================
+
+LEASE_SEC = 15 * 60          # job goes back to the queue 15 min after the last heartbeat
+MAX_ATTEMPTS = 3             # claims per job before it is marked failed
+BUSY_TIMEOUT_SEC = 60        # wait this long for another worker's write lock
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_key      TEXT PRIMARY KEY,
+    position     INTEGER NOT NULL,
+    payload      TEXT NOT NULL,
+    status       TEXT NOT NULL DEFAULT 'pending',
+    worker       TEXT,
+    lease_until  REAL,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    last_error   TEXT,
+    updated_at   REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_position ON jobs (status, position);
+"""
+
+
+def make_worker_id() -> str:
+    """host:pid:random — unique per worker process."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class LeaseQueue:
+    """
+    Lease-based job queue stored in one SQLite file.
+    Every method opens its own short connection, so one object can be used
+    from threads / asyncio.to_thread and from many processes at once.
+    """
+
+    def __init__(self, db_path, lease_sec: float = LEASE_SEC, max_attempts: int = MAX_ATTEMPTS):
+        self.db_path = str(db_path)
+        self.lease_sec = lease_sec
+        self.max_attempts = max_attempts
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    # ----------------- connection helpers -----------------
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT_SEC,
+            isolation_level=None,   # we issue BEGIN / COMMIT ourselves
+        )
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _write_txn(self):
+        """
+        BEGIN IMMEDIATE takes the write lock up front, so two workers can never
+        claim the same job.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    # ----------------- coordinator side -----------------
+
+    def seed(self, jobs) -> int:
+        """
+        Add jobs given as (job_key, payload_dict) in list order.
+        Already known keys are left untouched. Returns number of new jobs.
+        """
+        now = time.time()
+        added = 0
+        with self._write_txn() as conn:
+            row = conn.execute("SELECT COALESCE(MAX(position), 0) FROM jobs").fetchone()
+            position = row[0]
+            for job_key, payload in jobs:
+                position += 1
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO jobs (job_key, position, payload, status, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (job_key, position, json.dumps(payload, ensure_ascii=False), PENDING, now),
+                )
+                added += cur.rowcount
+        return added
+
+    # ----------------- worker side -----------------
+
+    def claim(self, worker_id: str) -> dict | None:
+        """
+        Lease the next pending job (or a job whose lease expired).
+        Returns {"job_key", "position", "payload", "attempts"} or None.
+        """
+        now = time.time()
+        with self._write_txn() as conn:
+            # expired leases that already used every attempt → failed
+            conn.execute(
+                "UPDATE jobs SET status = ?, last_error = COALESCE(last_error, 'lease expired'), "
+                "worker = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                (FAILED, now, LEASED, now, self.max_attempts),
+            )
+
+            row = conn.execute(
+                "SELECT job_key, position, payload, attempts FROM jobs "
+                "WHERE (status = ?) OR (status = ? AND lease_until < ?) "
+                "ORDER BY position LIMIT 1",
+                (PENDING, LEASED, now),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE job_key = ?",
+                (LEASED, worker_id, now + self.lease_sec, now, row["job_key"]),
+            )
+
+        return {
+            "job_key": row["job_key"],
+            "position": row["position"],
+            "payload": json.loads(row["payload"]),
+            "attempts": row["attempts"] + 1,
+        }
+
+    def heartbeat(self, job_key: str, worker_id: str) -> bool:
+        """
+        Extend the lease. False means the lease was lost (expired and taken
+        by another worker) — the caller should stop working on the job.
+        """
+        now = time.time()
+        with self._write_txn() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET lease_until = ?, updated_at = ? "
+                "WHERE job_key = ? AND worker = ? AND status = ?",
+                (now + self.lease_sec, now, job_key, worker_id, LEASED),
+            )
+            return cur.rowcount == 1
+
+    def complete(self, job_key: str, worker_id: str) -> bool:
+        return self._finish(job_key, worker_id, DONE, None)
+
+    def fail(self, job_key: str, worker_id: str, error: str = "", retry: bool = True) -> bool:
+        """
+        Give the job back (retry=True, attempts left) or mark it failed.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT attempts FROM jobs WHERE job_key = ?", (job_key,)
+            ).fetchone()
+
+        attempts = row["attempts"] if row else self.max_attempts
+        status = PENDING if retry and attempts < self.max_attempts else FAILED
+        return self._finish(job_key, worker_id, status, error)
+
+    def _finish(self, job_key, worker_id, status, error) -> bool:
+        now = time.time()
+        with self._write_txn() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, lease_until = NULL, "
+                "last_error = ?, updated_at = ? "
+                "WHERE job_key = ? AND worker = ? AND status = ?",
+                (status, error, now, job_key, worker_id, LEASED),
+            )
+            return cur.rowcount == 1
+
+    # ----------------- reporting -----------------
+
+    def counts(self) -> dict:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+            ).fetchall()
+        out = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        out.update({r["status"]: r["n"] for r in rows})
+        return out
+
+    def unfinished(self) -> int:
+        """Jobs that are still pending or leased by some worker."""
+        c = self.counts()
+        return c[PENDING] + c[LEASED]
@@ -0,0 +1,141 @@
+"""
+link_spool.py
+
+On-disk queue between the crawler (links_extracted_from_college.ipynb /
+scrapers.crawl_workers) and the downloader (pdfs_from_links.ipynb), so PDFs
+start downloading while colleges are still being crawled.
+
+- one JSONL file per college in the spool dir, written only by the worker
+  crawling that college (lines of two writers never interleave)
+- events:
+    link : college, depth, bucket, category, url, text
+    done : the crawler stopped working on the college (finished / timeout)
+- LinkSpoolReader tails every file of the dir. It remembers a byte offset
+  per file and only consumes complete lines, so it can run before, during
+  or after the crawl. A recreated file (college restarted from scratch) is
+  read again from the start.
+
+Every write is flushed + fsync'd, like the crawl journal.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+SUFFIX = ".jsonl"
+
+
+class LinkSpool:
+    """
+    Writer side: one college.
+    """
+
+    def __init__(self, spool_dir, college: str):
+        self.college = college
+        self.path = Path(spool_dir) / f"{college}{SUFFIX}"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _append(self, events: list):
+        if not events:
+            return 0
+
+        now = time.time()
+        data = "".join(
+            json.dumps({**e, "college": self.college, "ts": now}, ensure_ascii=False) + "\n"
+            for e in events
+        )
+        with open(self.path, "a+", encoding="utf-8") as f:
+            # torn last line from a crashed run → start on a fresh line
+            if f.tell() and not self._ends_with_newline():
+                data = "\n" + data
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(events)
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def publish(self, links) -> int:
+        """links: dicts with depth, bucket, category, url, text"""
+        return self._append([{"event": "link", **link} for link in links])
+
+    def mark_done(self):
+        self._append([{"event": "done"}])
+
+    def reset(self):
+        """Forget any previous crawl of this college."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class LinkSpoolReader:
+    """
+    Consumer side: every college file of one spool dir.
+    """
+
+    def __init__(self, spool_dir):
+        self.spool_dir = Path(spool_dir)
+        self.offsets = {}            # file → (first line, bytes consumed)
+        self.done = {}               # college → done marker seen (and no link after it)
+
+    def poll(self) -> list:
+        """New link events of every college since the last poll (file order)."""
+        if not self.spool_dir.is_dir():
+            return []
+
+        out = []
+        for path in sorted(self.spool_dir.glob(f"*{SUFFIX}")):
+            out.extend(self._read_new(path))
+        return out
+
+    def _read_new(self, path: Path) -> list:
+        try:
+            with open(path, "rb") as f:
+                head = f.readline()
+                size = os.fstat(f.fileno()).st_size
+
+                first, offset = self.offsets.get(path, (head, 0))
+                if first != head or size < offset:
+                    # recreated → college restarted from scratch (the first
+                    # line carries its write time, inode numbers get reused)
+                    offset = 0
+                if size == offset:
+                    return []
+
+                f.seek(offset)
+                data = f.read(size - offset)
+        except FileNotFoundError:
+            return []
+
+        # only complete lines; a line being written is picked up next poll
+        end = data.rfind(b"\n")
+        if end == -1:
+            return []
+        self.offsets[path] = (head, offset + end + 1)
+
+        out = []
+        for line in data[:end].splitlines():
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+
+            college = event.get("college") or path.stem
+            if event.get("event") == "done":
+                self.done[college] = True
+            elif event.get("event") == "link":
+                self.done[college] = False
+                out.append(event)
+
+        return out
+
+    @property
+    def all_done(self) -> bool:
+        """At least one college seen and every college has its done marker."""
+        return bool(self.done) and all(self.done.values())
@@ -0,0 +1,291 @@
+"""
+page_pool.py
+
+Page / browser recycling for the crawler, so long runs hold steady memory
+instead of opening (and leaking into) a fresh page per frontier URL.
+
+- PagePool (one per college BrowserContext)
+    acquire() → a warmed page (idle one or new), per-visit state reset
+    release() → listeners removed, in-flight handlers drained (event, no
+                busy-poll), page blanked (about:blank frees the DOM) and put
+                back, or closed when it was used PAGE_MAX_USES times, its JS
+                heap stayed above PAGE_MAX_HEAP_MB or it crashed / closed
+- BrowserManager (one per run)
+    lease() → the current browser; when the current browser's process tree
+    (its root process, found at launch, and all of its children) exceeds
+    max_rss_mb a new browser is launched for the next leases and the old one
+    is closed as soon as its last college finished (retired browsers are not
+    counted, so they cannot trigger further restarts)
+
+Per-visit page attributes are listed in PAGE_STATE_ATTRS; listeners a visit
+registers must be stored on the page (_on_response, _on_framenavigated) so
+the pool can remove them even when the visit returned early.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import psutil
+
+# ================= CONFIG =================
+
+PAGE_MAX_USES = 25
+PAGE_MAX_HEAP_MB = 300
+PAGE_IDLE_MAX = 4               # idle pages kept per pool
+DRAIN_TIMEOUT_SEC = 3
+BROWSER_MAX_RSS_MB = 3000
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "headless_shell")
+
+PAGE_STATE_ATTRS = (
+    "_seen_artifacts",
+    "_page_seen_urls",
+    "_clicked_elements",
+    "_local_seen_pdf",
+    "_doc_event",
+    "_main_url",
+    "_reverting",
+    "_route_stats",
+)
+
+PAGE_LISTENER_ATTRS = {
+    "_on_response": "response",
+    "_on_framenavigated": "framenavigated",
+}
+
+JS_HEAP_JS = "() => (performance.memory && performance.memory.usedJSHeapSize) || 0"
+
+
+# ----------------- page lifecycle (tasks started by page handlers) -----------------
+
+def reset_page_lifecycle(page):
+    page._closing = False
+    page._active_tasks = 0
+    page._tasks_idle = asyncio.Event()
+    page._tasks_idle.set()
+
+
+async def drain_page_tasks(page, timeout_sec: float = DRAIN_TIMEOUT_SEC) -> bool:
+    """Wait until no page handler task is running (True) or timeout (False)."""
+    idle = getattr(page, "_tasks_idle", None)
+    if idle is None or getattr(page, "_active_tasks", 0) <= 0:
+        return True
+    try:
+        await asyncio.wait_for(idle.wait(), timeout=timeout_sec)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+def remove_page_listeners(page):
+    for attr, event in PAGE_LISTENER_ATTRS.items():
+        handler = getattr(page, attr, None)
+        if handler is None:
+            continue
+        try:
+            page.remove_listener(event, handler)
+        except Exception:
+            pass
+        setattr(page, attr, None)
+
+
+# ----------------- page pool -----------------
+
+class PagePool:
+    def __init__(
+        self,
+        context,
+        *,
+        max_uses: int = PAGE_MAX_USES,
+        max_heap_mb: float = PAGE_MAX_HEAP_MB,
+        max_idle: int = PAGE_IDLE_MAX,
+    ):
+        self.context = context
+        self.max_uses = max_uses
+        self.max_heap_mb = max_heap_mb
+        self.max_idle = max_idle
+
+        self._idle = []
+        self._closed = False
+        self.stats = {"created": 0, "reused": 0, "recycled": 0}
+
+    async def acquire(self):
+        while self._idle:
+            page = self._idle.pop()
+            if not page.is_closed():
+                self.stats["reused"] += 1
+                break
+        else:
+            page = await self.context.new_page()
+            page._uses = 0
+            self.stats["created"] += 1
+
+        page._uses += 1
+        reset_page_lifecycle(page)
+        for attr in PAGE_STATE_ATTRS:
+            if hasattr(page, attr):
+                delattr(page, attr)
+        return page
+
+    async def release(self, page):
+        """Clean the page for the next visit (or close it)."""
+        page._closing = True
+        remove_page_listeners(page)
+        await drain_page_tasks(page)
+
+        if page.is_closed():
+            return
+
+        reuse = (
+            not self._closed
+            and page._uses < self.max_uses
+            and len(self._idle) < self.max_idle
+        )
+
+        if reuse:
+            try:
+                await page.goto("about:blank", wait_until="domcontentloaded", timeout=10000)
+                heap_mb = (await page.evaluate(JS_HEAP_JS)) / (1024 * 1024)
+                reuse = heap_mb < self.max_heap_mb
+            except Exception:
+                reuse = False
+
+        if reuse:
+            self._idle.append(page)
+            return
+
+        self.stats["recycled"] += 1
+        try:
+            await page.close()
+        except Exception:
+            pass
+
+    async def close(self):
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for page in idle:
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+
+# ----------------- browser restarts -----------------
+
+def browser_pids() -> set:
+    """Pids of every browser process started by this Python process."""
+    pids = set()
+    try:
+        children = psutil.Process().children(recursive=True)
+    except psutil.Error:
+        return pids
+
+    for proc in children:
+        try:
+            name = proc.name().lower()
+            if any(n in name for n in BROWSER_PROCESS_NAMES):
+                pids.add(proc.pid)
+        except psutil.Error:
+            continue
+    return pids
+
+
+def root_pids(pids: set) -> set:
+    """The pids of `pids` whose parent is not in `pids` (a browser's main process)."""
+    roots = set()
+    for pid in pids:
+        try:
+            if psutil.Process(pid).ppid() not in pids:
+                roots.add(pid)
+        except psutil.Error:
+            continue
+    return roots
+
+
+def browser_rss_mb(roots) -> float:
+    """RSS of the process trees rooted at `roots` (one browser)."""
+    total = 0
+    for pid in roots:
+        try:
+            root = psutil.Process(pid)
+            procs = [root] + root.children(recursive=True)
+        except psutil.Error:
+            continue
+        for proc in procs:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                continue
+    return total / (1024 * 1024)
+
+
+class BrowserManager:
+    def __init__(self, browser_type, *, max_rss_mb: float = BROWSER_MAX_RSS_MB, **launch_kwargs):
+        self.browser_type = browser_type
+        self.launch_kwargs = launch_kwargs
+        self.max_rss_mb = max_rss_mb
+
+        self._browser = None
+        self._users = {}                 # browser → running leases
+        self._roots = {}                 # browser → pids of its main process(es)
+        self._retired = set()
+        self._lock = asyncio.Lock()
+        self.restarts = 0
+
+    async def _current(self):
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                await self._launch()
+
+            elif self.max_rss_mb and browser_rss_mb(self._roots.get(self._browser, ())) > self.max_rss_mb:
+                old = self._browser
+                print(
+                    f"[BROWSER] RSS above {self.max_rss_mb:.0f} MB → new browser "
+                    f"(old one closes after its {self._users.get(old, 0)} running college(s))"
+                )
+                self._retired.add(old)
+                await self._launch()
+                self.restarts += 1
+                await self._close_if_unused(old)
+
+            self._users[self._browser] += 1
+            return self._browser
+
+    async def _launch(self):
+        # lock held → no other launch in between, the new pids are this browser's
+        before = browser_pids()
+        self._browser = await self.browser_type.launch(**self.launch_kwargs)
+        self._users[self._browser] = 0
+        self._roots[self._browser] = root_pids(browser_pids() - before)
+
+    async def _close_if_unused(self, browser):
+        if browser in self._retired and self._users.get(browser, 0) == 0:
+            self._retired.discard(browser)
+            self._users.pop(browser, None)
+            self._roots.pop(browser, None)
+            try:
+                await browser.close()
+            except Exception:
+                pass
+
+    @asynccontextmanager
+    async def lease(self):
+        browser = await self._current()
+        try:
+            yield browser
+        finally:
+            async with self._lock:
+                self._users[browser] -= 1
+                await self._close_if_unused(browser)
+
+    async def close(self):
+        async with self._lock:
+            browsers = list(self._users)
+            self._users.clear()
+            self._roots.clear()
+            self._retired.clear()
+            self._browser = None
+        for browser in browsers:
+            try:
+                await browser.close()
+            except Exception:
+                pass
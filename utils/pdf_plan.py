@@ -0,0 +1,261 @@
+"""
+pdf_plan.py
+
+Batched (pandas / NumPy) link extraction for pdfs_from_links.ipynb.
+
+The notebook used to walk every workbook with df.iterrows() × columns and
+re-split / re-normalize every cell per unit. Here the same rules run once
+per workbook as vectorized string ops with precompiled patterns:
+
+1. rows with row_type == "pdf"; every other column is a link column
+2. cells → (url + text) units  (a unit starts at http(s):// and ends right
+   before the next one, like split_links_with_text)
+3. depth 0 units must contain a category keyword (normalized substring)
+4. NIRF + innovation / management units are dropped
+5. first "https?://... .pdf" of the unit is the link
+6. units / links whose newest year is < MIN_YEAR are dropped (no year → kept)
+7. first occurrence of each link wins, target = <output_dir>/<newest year
+   or "no_year">/<filename>
+
+The result is a download plan (DataFrame) built before any network I/O.
+plan_units runs the same rules on units that did not come from a workbook
+(the streaming mode reads them from utils/link_spool.py).
+"""
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+# ================= CONFIG =================
+
+MIN_YEAR = 2019
+NO_YEAR_FOLDER = "no_year"
+
+NIRF_TERMS = ("nirf", "national_institutional_ranking_framework")
+INNOVATION_TERMS = ("innovation", "innv")
+MANAGEMENT_TERMS = (
+    "management", "mgmt", "mgmnt", "mgt", "mba", "pgdm", "business_administration",
+)
+
+SKIP_COLUMNS = {"row_type", "depth"}
+PLAN_COLUMNS = ["link", "file_path", "unit", "depth"]
+
+UNIT_PATTERN = re.compile(r"https?://(?:(?!https?://).)*", re.DOTALL)
+PDF_LINK_PATTERN = re.compile(r"(https?://(?:[^\s]|[\s\-]){1,1000}?\.pdf)", re.IGNORECASE)
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_YEAR_SEPARATORS = re.compile(r"[._/\\\-–—]+")
+_WHITESPACE = re.compile(r"\s+")
+_YEAR = re.compile(r"(?<!\d)(19\d{2}|20\d{2})(?!\d)")
+_YEAR_RANGE = re.compile(r"(?<!\d)(19\d{2}|20\d{2})\s*[-/–—_]\s*(\d{2}|19\d{2}|20\d{2})(?!\d)")
+
+
+def _any_of(terms):
+    terms = sorted({t for t in terms if t}, key=lambda t: (-len(t), t))
+    if not terms:
+        return None
+    return re.compile("|".join(re.escape(t) for t in terms))
+
+
+_NIRF = _any_of(NIRF_TERMS)
+_INNOVATION_OR_MANAGEMENT = _any_of(INNOVATION_TERMS + MANAGEMENT_TERMS)
+
+
+# ----------------- vectorized primitives -----------------
+
+def normalize_series(text: pd.Series) -> pd.Series:
+    """Same as normalize_text_for_match: lowercase, non-alnum runs → "_", strip "_"."""
+    return (
+        text.str.lower()
+        .str.replace(_NON_ALNUM, "_", regex=True)
+        .str.strip("_")
+    )
+
+
+def contains_any(norm: pd.Series, pattern) -> pd.Series:
+    if pattern is None:
+        return pd.Series(False, index=norm.index)
+    return norm.str.contains(pattern, regex=True)
+
+
+def _max_year(found) -> float:
+    years = [int(y) for y in found[0]]
+    for y1, y2 in found[1]:
+        years.append(int(y1))
+        years.append(int(y1[:2] + y2) if len(y2) == 2 else int(y2))
+    return max(years) if years else np.nan
+
+
+def newest_year(text: pd.Series) -> pd.Series:
+    """
+    max(extract_document_years(text)) per row, NaN if the text has no year.
+    Computed once per distinct text.
+    """
+    codes, uniques = pd.factorize(text)
+    uniques = pd.Series(uniques)
+
+    norm = (
+        uniques.str.normalize("NFKD")
+        .str.replace(_YEAR_SEPARATORS, " ", regex=True)
+        .str.replace("%20", " ", regex=False)
+        .str.replace(_WHITESPACE, " ", regex=True)
+        .str.strip()
+    )
+    found = zip(norm.str.findall(_YEAR), norm.str.findall(_YEAR_RANGE))
+    best = np.array([_max_year(f) for f in found], dtype=float)
+
+    return pd.Series(best[codes], index=text.index)
+
+
+def split_units(cells: pd.Series) -> pd.Series:
+    """
+    Link cells → one (url + text) unit per row. The result index points
+    back to the cell; the order of units inside a cell is kept.
+    """
+    text = (
+        cells.str.replace("\r", " ", regex=False)
+        .str.replace("\n", " ", regex=False)
+        .str.strip()
+    )
+    units = text.str.findall(UNIT_PATTERN).explode().dropna()
+    return units.str.strip()
+
+
+# ----------------- plan -----------------
+
+def empty_plan() -> pd.DataFrame:
+    return pd.DataFrame(columns=PLAN_COLUMNS)
+
+
+def new_skip_counts() -> dict:
+    return dict.fromkeys(("no_keyword", "nirf", "no_link", "old_year", "duplicate"), 0)
+
+
+def build_workbook_plan(
+    df: pd.DataFrame,
+    output_dir: str,
+    keywords,
+    filename_fn,
+    *,
+    min_year: int = MIN_YEAR,
+):
+    """
+    One workbook → (plan, skipped), see plan_units.
+    The plan is in workbook order (row → column → unit).
+    """
+    if "row_type" not in df.columns:
+        return empty_plan(), new_skip_counts()
+
+    is_pdf = df["row_type"].astype(str).str.strip().str.lower() == "pdf"
+    rows = df[is_pdf]
+    link_cols = [c for c in df.columns if c not in SKIP_COLUMNS]
+    if rows.empty or not link_cols:
+        return empty_plan(), new_skip_counts()
+
+    if "depth" in rows.columns:
+        depth = pd.to_numeric(rows["depth"], errors="coerce").fillna(-1).astype(int).to_numpy()
+    else:
+        depth = np.full(len(rows), -1)
+
+    # row-major flatten → same order as iterrows() × columns
+    cells = pd.Series(rows[link_cols].to_numpy(dtype=object).ravel())
+    cell_depth = np.repeat(depth, len(link_cols))
+
+    units = split_units(cells)
+    return plan_units(
+        units.reset_index(drop=True),
+        cell_depth[units.index.to_numpy()],
+        output_dir,
+        keywords,
+        filename_fn,
+        min_year=min_year,
+    )
+
+
+def plan_units(
+    units: pd.Series,
+    depth,
+    output_dir: str,
+    keywords,
+    filename_fn,
+    *,
+    min_year: int = MIN_YEAR,
+    seen: set | None = None,
+):
+    """
+    (url + text) units → (plan, skipped)
+    - plan    : DataFrame[link, file_path, unit, depth], one row per PDF, in
+                unit order
+    - skipped : {"no_keyword": n, "nirf": n, "no_link": n, "old_year": n, "duplicate": n}
+    depth       : depth of every unit (array-like, same length)
+    keywords    : normalized category keywords (depth 0 filter)
+    filename_fn : link → file name
+    seen        : links planned by earlier batches (streaming) → skipped as
+                  duplicates; the new links are added to it
+    """
+    skipped = new_skip_counts()
+    if units.empty:
+        return empty_plan(), skipped
+
+    # every rule depends on the unit text only → evaluate each distinct unit once
+    codes, uniques = pd.factorize(units)
+    uniq = pd.DataFrame({"unit": uniques})
+    norm = normalize_series(uniq["unit"])
+    uniq["has_keyword"] = contains_any(norm, _any_of(keywords))
+    uniq["nirf"] = contains_any(norm, _NIRF) & contains_any(norm, _INNOVATION_OR_MANAGEMENT)
+    uniq["link"] = uniq["unit"].str.extract(PDF_LINK_PATTERN, expand=False)
+
+    frame = uniq.iloc[codes].reset_index(drop=True)
+    frame["depth"] = np.asarray(depth, dtype=int)
+
+    keep = pd.Series(True, index=frame.index)
+
+    # depth 0 → the unit itself must mention a category
+    no_keyword = (frame["depth"] == 0) & ~frame["has_keyword"]
+    skipped["no_keyword"] = int(no_keyword.sum())
+    keep &= ~no_keyword
+
+    nirf = keep & frame["nirf"]
+    skipped["nirf"] = int(nirf.sum())
+    keep &= ~nirf
+
+    no_link = keep & frame["link"].isna()
+    skipped["no_link"] = int(no_link.sum())
+    keep &= ~no_link
+
+    frame = frame[keep]
+    if frame.empty:
+        return empty_plan(), skipped
+
+    unit_year = newest_year(frame["unit"])
+    link_year = newest_year(frame["link"])
+    old = (unit_year < min_year) | (link_year < min_year)
+    skipped["old_year"] = int(old.sum())
+    frame = frame[~old]
+    unit_year = unit_year[~old]
+
+    deduped = frame.drop_duplicates("link")
+    if seen:
+        deduped = deduped[~deduped["link"].isin(seen)]
+    skipped["duplicate"] = len(frame) - len(deduped)
+    frame = deduped
+    unit_year = unit_year.loc[frame.index]
+
+    if frame.empty:
+        return empty_plan(), skipped
+
+    if seen is not None:
+        seen.update(frame["link"])
+
+    year_folder = unit_year.map(lambda y: NO_YEAR_FOLDER if pd.isna(y) else str(int(y)))
+    filenames = frame["link"].map(filename_fn)
+
+    frame = frame.assign(
+        file_path=[
+            os.path.join(output_dir, folder, name)
+            for folder, name in zip(year_folder, filenames)
+        ]
+    )
+    return frame[PLAN_COLUMNS].reset_index(drop=True), skipped
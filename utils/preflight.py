@@ -0,0 +1,247 @@
+"""
+preflight.py
+
+Reachability pre-flight for a college URL list, before any browser slot
+(crawler) or Selenium session (eduValidUrlChecking.py) is spent on it.
+
+- every URL is checked concurrently (thread pool, one keep-alive session):
+    1. DNS: getaddrinfo of the host          → "dns_failed"
+    2. HTTP: GET (body not read), redirects followed; a failing https:// is
+       tried once as http:// and the other way round
+                                             → "unreachable" (timeout /
+                                               connection / TLS error)
+    3. any HTTP answer                       → "ok" (< 500) / "http_error"
+       final_url = URL after redirects (canonical scheme + host)
+- results are cached in a JSON file with a TTL (ALIVE_TTL_SEC for live
+  hosts, DEAD_TTL_SEC for dead ones, so those are retried sooner)
+- if not a single one of OUTAGE_MIN_URLS+ probed URLs is alive, the local
+  network / resolver is the problem: nothing is cached and the URLs are
+  returned without a result (= alive, nothing gets skipped)
+
+Usage:
+    results = run_preflight(urls, PreflightCache("preflight.json"))
+    results[url] → {"url", "status", "final_url", "http_status", "error", "checked_at"}
+    is_alive(results[url])
+"""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# ================= CONFIG =================
+
+WORKERS = 32
+CONNECT_TIMEOUT = 8
+READ_TIMEOUT = 15
+MAX_REDIRECTS = 10
+ALIVE_TTL_SEC = 7 * 24 * 3600
+DEAD_TTL_SEC = 24 * 3600
+OUTAGE_MIN_URLS = 5            # this many probed and not one alive → our own network is down
+
+OK = "ok"
+HTTP_ERROR = "http_error"
+DNS_FAILED = "dns_failed"
+UNREACHABLE = "unreachable"
+INVALID = "invalid_url"
+ALIVE_STATUSES = {OK, HTTP_ERROR}
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,*/*;q=0.8",
+}
+
+
+def normalize_url(url: str) -> str:
+    """Scheme-less list entries ("www.x.ac.in/") get https://."""
+    url = (url or "").strip()
+    if url and not url.lower().startswith(("http://", "https://")):
+        url = "https://" + url
+    return url
+
+
+def is_alive(result: dict | None) -> bool:
+    """Unknown (no result) counts as alive: never skip on missing data."""
+    return result is None or result.get("status") in ALIVE_STATUSES
+
+
+def _other_scheme(url: str) -> str:
+    if url.startswith("https://"):
+        return "http://" + url[len("https://"):]
+    return "https://" + url[len("http://"):]
+
+
+class PreflightCache:
+    """
+    url → last result, kept in one JSON file. Expired results are not
+    returned (checked again), save() writes atomically.
+    """
+
+    def __init__(self, path=None, *, alive_ttl_sec: float = ALIVE_TTL_SEC, dead_ttl_sec: float = DEAD_TTL_SEC):
+        self.path = str(path) if path else None
+        self.alive_ttl_sec = alive_ttl_sec
+        self.dead_ttl_sec = dead_ttl_sec
+        self._results = {}
+        self._lock = threading.Lock()
+
+        if self.path:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._results = json.load(f)
+            except (OSError, ValueError):
+                self._results = {}
+
+    def get(self, url: str) -> dict | None:
+        with self._lock:
+            result = self._results.get(url)
+        if result is None:
+            return None
+        ttl = self.alive_ttl_sec if is_alive(result) else self.dead_ttl_sec
+        if time.time() - result.get("checked_at", 0) > ttl:
+            return None
+        return result
+
+    def put(self, result: dict):
+        with self._lock:
+            self._results[result["url"]] = result
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = json.dumps(self._results, ensure_ascii=False)
+
+        dirn = os.path.dirname(self.path) or "."
+        os.makedirs(dirn, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=dirn, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, self.path)
+
+
+class Prober:
+    def __init__(self, workers: int = WORKERS, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.max_redirects = MAX_REDIRECTS
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._dns = {}                   # host → error (None = resolved)
+        self._dns_lock = threading.Lock()
+
+    def resolve(self, host: str) -> str | None:
+        """None if the host resolves, else the resolver error."""
+        with self._dns_lock:
+            if host in self._dns:
+                return self._dns[host]
+        try:
+            socket.getaddrinfo(host, None)
+            error = None
+        except (socket.gaierror, UnicodeError) as e:
+            error = f"{type(e).__name__}: {e}"
+        with self._dns_lock:
+            self._dns[host] = error
+        return error
+
+    def get(self, url: str):
+        with self.session.get(url, stream=True, timeout=self.timeout, allow_redirects=True) as r:
+            return r.status_code, r.url
+
+    def probe(self, url: str) -> dict:
+        result = {
+            "url": url, "status": None, "final_url": None,
+            "http_status": None, "error": None, "checked_at": time.time(),
+        }
+
+        target = normalize_url(url)
+        host = urlparse(target).hostname if target else None
+        if not host:
+            result.update(status=INVALID, error="no host")
+            return result
+
+        error = self.resolve(host)
+        if error:
+            result.update(status=DNS_FAILED, error=error)
+            return result
+
+        last_error = None
+        for candidate in (target, _other_scheme(target)):
+            try:
+                status, final_url = self.get(candidate)
+            except Exception as e:
+                # requests errors, but also urllib3 / idna failures on odd hosts
+                last_error = f"{type(e).__name__}: {e}"
+                continue
+
+            result.update(
+                status=OK if status < 500 else HTTP_ERROR,
+                http_status=status,
+                final_url=final_url,
+            )
+            return result
+
+        result.update(status=UNREACHABLE, error=last_error)
+        return result
+
+    def close(self):
+        self.session.close()
+
+
+def run_preflight(urls, cache: PreflightCache | None = None, *, workers: int = WORKERS, on_result=None) -> dict:
+    """
+    Check every distinct URL (cached results within their TTL are reused).
+    Returns {url: result}; URLs probed during a local outage are missing.
+    on_result(result, cached) is called per URL.
+    """
+    cache = cache or PreflightCache()
+    results = {}
+    todo = []
+
+    for url in dict.fromkeys(urls):
+        hit = cache.get(url)
+        if hit is not None:
+            results[url] = hit
+            if on_result is not None:
+                on_result(hit, True)
+        else:
+            todo.append(url)
+
+    if todo:
+        prober = Prober(workers=workers)
+
+        def job(url):
+            result = prober.probe(url)
+            if on_result is not None:
+                on_result(result, False)
+            return result
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="preflight") as pool:
+                probed = list(pool.map(job, todo))
+        finally:
+            prober.close()
+
+        if len(probed) >= OUTAGE_MIN_URLS and not any(is_alive(r) for r in probed):
+            print(f"[PREFLIGHT] none of {len(probed)} host(s) reachable → local network down? results ignored")
+            return results
+
+        for result in probed:
+            cache.put(result)
+            results[result["url"]] = result
+        cache.save()
+
+    return results
@@ -0,0 +1,138 @@
+"""
+resource_blocker.py
+
+Request routing for crawl pages: the crawler only needs the DOM, the links
+and the document responses, so images / media / fonts and well-known
+analytics / ad / chat widgets are aborted before they hit the network.
+
+- installed once per college BrowserContext (context.route)
+- never blocks navigations, xhr / fetch or anything that looks like a
+  document (.pdf / .docx / .xlsx ...), so on_response still sees every
+  document and its capture keeps working
+- per-page stats on page._route_stats: requests allowed / blocked and an
+  ESTIMATE of the bytes saved (blocked requests never send a response, so
+  their size is unknown; TYPICAL_BYTES per resource type is used instead)
+
+Note: Playwright turns the browser HTTP cache off while routing is active.
+Blocked images / fonts easily outweigh the lost CSS / JS cache hits.
+"""
+
+from urllib.parse import urlparse
+
+# ================= CONFIG =================
+
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+TRACKER_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "connect.facebook.net",
+    "facebook.com/tr",
+    "analytics.twitter.com",
+    "static.ads-twitter.com",
+    "snap.licdn.com",
+    "hotjar.com",
+    "clarity.ms",
+    "mc.yandex.ru",
+    "tawk.to",
+    "crisp.chat",
+    "zopim.com",
+    "addthis.com",
+    "sharethis.com",
+    "onesignal.com",
+)
+
+DOCUMENT_EXTENSIONS = (
+    ".pdf", ".doc", ".docx", ".xls", ".xlsx", ".csv", ".ppt", ".pptx",
+)
+
+# rough transfer size of one blocked request (bytes saved is an estimate)
+TYPICAL_BYTES = {
+    "image": 60_000,
+    "media": 500_000,
+    "font": 40_000,
+    "script": 40_000,
+}
+DEFAULT_TYPICAL_BYTES = 10_000
+
+
+def _new_stats() -> dict:
+    return {"allowed": 0, "blocked": 0, "saved_bytes": 0}
+
+
+class ResourceBlocker:
+    def __init__(self, blocked_types=BLOCKED_RESOURCE_TYPES, tracker_domains=TRACKER_DOMAINS):
+        self.blocked_types = set(blocked_types)
+        self.tracker_hosts = tuple(d for d in tracker_domains if "/" not in d)
+        self.tracker_suffixes = tuple("." + d for d in self.tracker_hosts)
+        self.tracker_prefixes = tuple(d for d in tracker_domains if "/" in d)
+
+    async def install(self, context):
+        await context.route("**/*", self._handle)
+
+    def block_reason(self, resource_type: str, url: str) -> str | None:
+        """None → let it through, else why it is blocked."""
+        if resource_type == "document":
+            return None
+
+        parsed = urlparse(url)
+        if parsed.path.lower().endswith(DOCUMENT_EXTENSIONS):
+            return None
+
+        host = parsed.netloc.lower()
+        if host in self.tracker_hosts or host.endswith(self.tracker_suffixes):
+            return "tracker"
+        if self.tracker_prefixes and (host.removeprefix("www.") + parsed.path).startswith(self.tracker_prefixes):
+            return "tracker"
+
+        if resource_type in self.blocked_types:
+            return resource_type
+
+        return None
+
+    async def _handle(self, route):
+        request = route.request
+
+        try:
+            reason = self.block_reason(request.resource_type, request.url)
+        except Exception:
+            reason = None
+
+        stats = _page_stats(request)
+
+        try:
+            if reason is None:
+                if stats is not None:
+                    stats["allowed"] += 1
+                await route.continue_()
+            else:
+                if stats is not None:
+                    stats["blocked"] += 1
+                    stats["saved_bytes"] += TYPICAL_BYTES.get(request.resource_type, DEFAULT_TYPICAL_BYTES)
+                await route.abort("blockedbyclient")
+        except Exception:
+            # page / context already closed
+            pass
+
+
+def _page_stats(request) -> dict | None:
+    try:
+        page = request.frame.page
+    except Exception:
+        # service worker / page already gone
+        return None
+
+    stats = getattr(page, "_route_stats", None)
+    if stats is None:
+        stats = page._route_stats = _new_stats()
+    return stats
+
+
+def route_report(page) -> tuple[int, int, int]:
+    """(requests allowed, requests blocked, estimated bytes saved) on this page."""
+    stats = getattr(page, "_route_stats", None) or _new_stats()
+    return stats["allowed"], stats["blocked"], stats["saved_bytes"]
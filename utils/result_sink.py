@@ -0,0 +1,184 @@
+"""
+result_sink.py
+
+Append-only result sinks, so saving progress costs O(new rows) instead of
+rewriting the whole Excel workbook after every page / institute.
+
+Backends:
+- JsonlSink  : one JSON record per line (default, no extra dependency)
+- SqliteSink : one row per record in a SQLite table (records stored as JSON)
+
+The Excel file is built ONCE from sink.read() at the end of a college / run
+(see write_excel below).
+
+Every write() is flushed + fsync'd, so a crash loses at most the batch that
+was being written. A half-written JSONL line is skipped by read(), and the
+next write() starts on a fresh line after it.
+"""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+
+class JsonlSink:
+    suffix = ".jsonl"
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, records):
+        records = list(records)
+        if not records:
+            return 0
+
+        data = "".join(
+            json.dumps(r, ensure_ascii=False, default=str) + "\n"
+            for r in records
+        )
+        if self._torn_tail():
+            data = "\n" + data
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(records)
+
+    def read(self) -> list:
+        if not self.path.exists():
+            return []
+
+        out = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    out.append(json.loads(line))
+                except ValueError:
+                    # torn write from a crash (later batches are still good)
+                    continue
+        return out
+
+    def _torn_tail(self) -> bool:
+        """True if the file does not end with a newline (crash mid-write)."""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return False
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except FileNotFoundError:
+            return False
+
+    def reset(self):
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SqliteSink:
+    suffix = ".sqlite"
+
+    def __init__(self, path, table: str = "results"):
+        self.path = Path(path)
+        self.table = table
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._create()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=60)
+
+    def _create(self):
+        conn = self._connect()
+        try:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                f"(id INTEGER PRIMARY KEY AUTOINCREMENT, record TEXT NOT NULL)"
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def write(self, records):
+        rows = [
+            (json.dumps(r, ensure_ascii=False, default=str),)
+            for r in records
+        ]
+        if not rows:
+            return 0
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO {self.table} (record) VALUES (?)", rows
+                )
+        finally:
+            conn.close()
+        return len(rows)
+
+    def read(self) -> list:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT record FROM {self.table} ORDER BY id"
+            ).fetchall()
+        finally:
+            conn.close()
+        return [json.loads(r[0]) for r in rows]
+
+    def reset(self):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(f"DELETE FROM {self.table}")
+        finally:
+            conn.close()
+
+
+SINKS = {
+    "jsonl": JsonlSink,
+    "sqlite": SqliteSink,
+}
+
+
+def open_sink(path_without_suffix, kind: str = "jsonl"):
+    """
+    open_sink("output/1_ABC", "jsonl") → JsonlSink("output/1_ABC.jsonl")
+    """
+    try:
+        cls = SINKS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown sink {kind!r}, expected one of {sorted(SINKS)}")
+
+    path = Path(path_without_suffix)
+    return cls(path.with_name(path.name + cls.suffix))
+
+
+def write_excel(rows, output_file, columns=None, dedupe: bool = True):
+    """
+    Materialize rows into one Excel file.
+    - columns : column order (missing ones are added empty, extra ones kept at the end)
+    - dedupe  : drop rows written twice (e.g. replayed after a crash)
+    """
+    df = pd.DataFrame(list(rows))
+
+    if columns is not None:
+        for c in columns:
+            if c not in df.columns:
+                df[c] = ""
+        df = df[list(columns) + [c for c in df.columns if c not in columns]]
+
+    if dedupe and not df.empty:
+        df = df.drop_duplicates(ignore_index=True)
+
+    df.to_excel(output_file, index=False)
+    return len(df)
@@ -0,0 +1,158 @@
+"""
+static_page.py
+
+HTTP-first fast path of the crawler: parse a server-rendered HTML page
+without a browser and decide whether the browser is needed at all.
+
+- StaticLinkParser (stdlib html.parser, single pass):
+    a[href]                 → href + text (text / title / aria-label)
+    iframe / embed / object → src / data + title
+    <meta http-equiv="refresh">
+    widget signals the browser stage would click:
+        [role="tab"], [aria-expanded][role="button"], details > summary,
+        select, JS-only links (href="javascript:..." / "#" + onclick,
+        onclick without href)
+- parse_static_page(html) → StaticPage
+- StaticPage.escalation_reason(...) → None if the static result is enough,
+  else why the page has to go through the browser
+"""
+
+import re
+from html.parser import HTMLParser
+
+# ================= CONFIG =================
+
+MIN_STATIC_LINKS = 10        # fewer anchors → probably rendered by JS
+MAX_JS_LINKS = 2             # more JS-only links → content behind clicks
+
+_WS = re.compile(r"\s+")
+_SKIP_TEXT_TAGS = {"script", "style", "noscript", "template"}
+_FRAME_TAGS = {"iframe", "embed", "object"}
+
+
+class StaticPage:
+    def __init__(self):
+        self.anchors = []            # {"kind": "a", "href", "text"}
+        self.sources = []            # {"kind": tag, "href", "text"}
+        self.widgets = {"tab": 0, "accordion": 0, "select": 0, "js_link": 0}
+        self.frames = 0              # iframes (their links need a browser)
+        self.meta_refresh = False
+
+    @property
+    def items(self) -> list:
+        """Same shape as HARVEST_LINKS_JS items."""
+        return self.anchors + self.sources
+
+    def escalation_reason(self, min_links: int = MIN_STATIC_LINKS, max_js_links: int = MAX_JS_LINKS) -> str | None:
+        w = self.widgets
+        if self.meta_refresh:
+            return "meta refresh"
+        if w["tab"]:
+            return f"{w['tab']} tab(s)"
+        if w["accordion"]:
+            return f"{w['accordion']} accordion(s)"
+        if w["select"]:
+            return f"{w['select']} dropdown(s)"
+        if w["js_link"] > max_js_links:
+            return f"{w['js_link']} JS-only link(s)"
+        if self.frames:
+            return f"{self.frames} iframe(s)"
+        if len(self.anchors) < min_links:
+            return f"only {len(self.anchors)} link(s)"
+        return None
+
+
+class StaticLinkParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.page = StaticPage()
+        self._anchor = None          # open <a>: [href, title, aria_label, text parts]
+        self._skip_depth = 0
+        self._in_details = 0
+
+    # ----------------- tags -----------------
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        page = self.page
+
+        if tag in _SKIP_TEXT_TAGS:
+            self._skip_depth += 1
+            return
+
+        role = (a.get("role") or "").lower()
+        if role == "tab":
+            page.widgets["tab"] += 1
+        elif role == "button" and "aria-expanded" in a:
+            page.widgets["accordion"] += 1
+
+        if tag == "details":
+            self._in_details += 1
+        elif tag == "summary" and self._in_details:
+            page.widgets["accordion"] += 1
+        elif tag == "select":
+            page.widgets["select"] += 1
+
+        elif tag == "a":
+            self._close_anchor()
+            href = a.get("href")
+            if href is None:
+                if a.get("onclick"):
+                    page.widgets["js_link"] += 1
+                return
+            h = href.strip().lower()
+            if h.startswith("javascript:") or (h in ("", "#") and a.get("onclick")):
+                page.widgets["js_link"] += 1
+            self._anchor = [href, a.get("title"), a.get("aria-label"), []]
+
+        elif tag in _FRAME_TAGS:
+            src = a.get("data" if tag == "object" else "src")
+            if tag == "iframe" and src:
+                page.frames += 1
+            if src:
+                page.sources.append({"kind": tag, "href": src, "text": a.get("title") or ""})
+
+        elif tag == "meta" and (a.get("http-equiv") or "").lower() == "refresh":
+            page.meta_refresh = True
+
+        elif a.get("onclick") and tag in ("button", "li", "div", "span"):
+            page.widgets["js_link"] += 1
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TEXT_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "a":
+            self._close_anchor()
+        elif tag == "details":
+            self._in_details = max(0, self._in_details - 1)
+
+    def handle_data(self, data):
+        if self._anchor is not None and not self._skip_depth:
+            self._anchor[3].append(data)
+
+    def close(self):
+        super().close()
+        self._close_anchor()
+
+    # ----------------- helpers -----------------
+
+    def _close_anchor(self):
+        if self._anchor is None:
+            return
+        href, title, aria, parts = self._anchor
+        self._anchor = None
+
+        # ≈ innerText || title || aria-label (collect_dom_anchors)
+        text = _WS.sub(" ", "".join(parts)).strip() or title or aria or ""
+        self.page.anchors.append({"kind": "a", "href": href, "text": text})
+
+
+def parse_static_page(html: str) -> StaticPage:
+    parser = StaticLinkParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        # broken markup → whatever was parsed so far (escalation decides)
+        pass
+    return parser.page